@@ -2,22 +2,41 @@
 Handles C++ compilation and static library creation with parallel builds.
 """
 
+import hashlib
 import os
+import shutil
 import subprocess
+import sys
 import time
 import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable, Set
+from typing import Dict, List, Optional, Any, Callable, Sequence, Set
+import importlib.machinery
 import importlib.util
+import py_compile
 import shlex  # Add this import at the top with other imports
+from collections import deque
+from functools import lru_cache
 
+try:
+    import orjson  # Serializes several times faster than stdlib json
+except ImportError:
+    orjson = None
+
+from .cmake_configure import cmake_configure_file
 from .target import Target, GeneratedFile
 from .toolchain import Toolchain
 from .utils import ensure_dir, normalize_path
-from .feature import FeatureTestTask
+from .feature import (FeatureTestTask, includes_block,
+                      COMPILER_FLAG_TEST_TEMPLATE, HEADER_TEST_TEMPLATE,
+                      TYPE_TEST_TEMPLATE, FUNCTION_TEST_TEMPLATE,
+                      STRUCT_MEMBER_TEST_TEMPLATE)
+
+# The compiler-flag probe has no substitutions; render it once at import
+_COMPILER_FLAG_PROBE_SRC = COMPILER_FLAG_TEST_TEMPLATE.strip().format_map({})
 
 @dataclass
 class CommandResult:
@@ -35,22 +54,284 @@ class CompileCommand:
     Created by Builder for each source file in Target.
     Contains normalized paths and full command."""
     directory: str      # Directory to run command in
-    command: List[str]  # Full compilation command as list of strings
+    command: tuple      # Full compilation command as a tuple of strings
     source_file: str    # Source file path
     output_file: str    # Output object file path
     result: Optional[CommandResult] = None
+    _joined_command: Optional[str] = None  # Cached shlex.join of command
+    _json_dict: Optional[dict] = None      # Cached to_json_dict result
+    source_basename: str = field(init=False)  # Basename of source_file, for progress output
+
+    def __post_init__(self):
+        self.source_basename = os.path.basename(self.source_file)
 
     def to_json_dict(self) -> dict:
         """Convert to compile_commands.json format."""
-        return {
-            "directory": self.directory,
-            "command": shlex.join(self.command),  # Use shlex.join for proper escaping
-            "file": self.source_file
-        }
+        if self._json_dict is None:
+            # The command list never mutates, so join (which quote-checks
+            # every argument) and build the entry dict only once
+            self._joined_command = shlex.join(self.command)
+            self._json_dict = {
+                "directory": self.directory,
+                "command": self._joined_command,
+                "file": self.source_file
+            }
+        return self._json_dict
+
+# Extensions compiled as C++ rather than C
+_CPP_EXTENSIONS = frozenset({'.cpp', '.cxx', '.cc'})
+
+@lru_cache(maxsize=None)
+def _compiler_fingerprint(executable: str) -> tuple:
+    """Resolve a compiler executable and capture its mtime, once per path.
+
+    Returns:
+        Tuple of (resolved path, mtime_ns as a string; "0" if unknown)
+    """
+    exe = shutil.which(executable) or executable
+    try:
+        mtime = os.stat(exe).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return exe, str(mtime)
+
+@lru_cache(maxsize=1)
+def _detect_compile_cache() -> Optional[str]:
+    """Find a compiler cache wrapper (sccache, then ccache) on PATH.
+
+    Returns the executable path, or None when no wrapper is installed or
+    BUILD_TOOLKIT_NO_CACHE=1 opts out.
+    """
+    if os.environ.get("BUILD_TOOLKIT_NO_CACHE") == "1":
+        return None
+    return shutil.which("sccache") or shutil.which("ccache")
+
+@lru_cache(maxsize=None)
+def _norm_abs(path: str, root: str = "") -> str:
+    """Join a path with its root (unless absolute), make absolute, normalize.
+
+    Cached because the same include dirs and source roots are normalized
+    over and over across targets; abspath costs a syscall on some platforms.
+    The result is interned so the many copies of a path that circulate
+    through dependency closures share one string object and compare by
+    identity in dict/set lookups.
+    """
+    if root and not os.path.isabs(path):
+        path = os.path.join(root, path)
+    # normalize_path already makes the path absolute; one pass is enough
+    return sys.intern(normalize_path(path))
+
+def _parse_depfile(depfile_path: str) -> List[str]:
+    """Parse a Make-style .d dependency file into a list of paths.
+
+    Handles backslash-newline continuations and backslash-escaped spaces
+    as emitted by gcc/clang -MD.
+    """
+    with open(depfile_path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    # Join continuation lines and drop the "target:" prefix
+    text = text.replace('\\\n', ' ').replace('\\\r\n', ' ')
+    if ':' in text:
+        text = text.split(':', 1)[1]
+    # Split on unescaped whitespace, then unescape
+    deps = []
+    for token in text.replace('\\ ', '\0').split():
+        deps.append(token.replace('\0', ' '))
+    return deps
+
+def _is_up_to_date(cmd: CompileCommand) -> bool:
+    """Check whether a compile command's output is already fresh.
+
+    The object file is fresh if it is newer than the source file and every
+    header recorded in the sibling .d depfile from the previous compile.
+    Missing object, depfile, or dependency means stale.
+    """
+    try:
+        obj_mtime = os.path.getmtime(cmd.output_file)
+    except OSError:
+        return False
+
+    try:
+        if os.path.getmtime(cmd.source_file) > obj_mtime:
+            return False
+    except OSError:
+        return False
+
+    depfile = cmd.output_file + ".d"
+    if not os.path.exists(depfile):
+        return False
+
+    try:
+        for dep in _parse_depfile(depfile):
+            if os.path.getmtime(dep) > obj_mtime:
+                return False
+    except OSError:
+        return False
+
+    return True
+
+def _replicate_object(src_cmd: CompileCommand, dst_cmd: CompileCommand) -> None:
+    """Replicate a compiled object (and its depfile) into another output path.
+
+    Used when several targets compile the same source with identical flags;
+    hard-links where possible and falls back to copying.
+    """
+    ensure_dir(dst_cmd.directory)
+    for suffix in ("", ".d"):
+        src = src_cmd.output_file + suffix
+        dst = dst_cmd.output_file + suffix
+        if not os.path.exists(src):
+            continue
+        if os.path.exists(dst):
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copyfile(src, dst)
+
+def _compile_cache_key(command: Sequence[str], output_file: str) -> Optional[str]:
+    """Compute a content hash identifying a compilation's inputs.
+
+    Runs the compiler in preprocess-only mode so the hash covers the source
+    file and every transitively included header, then mixes in the full
+    command line. Returns None if preprocessing fails (e.g. the source has
+    errors); the caller falls back to a normal compile in that case.
+    """
+    # Drop the "-o <obj>" pair and preprocess to stdout instead
+    pp_cmd = []
+    skip_next = False
+    for arg in command:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg == "-o":
+            skip_next = True
+            continue
+        pp_cmd.append(arg)
+    pp_cmd.append("-E")
+
+    try:
+        process = subprocess.run(pp_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except Exception:
+        return None
+    if process.returncode != 0:
+        return None
+
+    hasher = hashlib.sha256()
+    hasher.update(process.stdout)
+    hasher.update(shlex.join(command).encode('utf-8'))
+    return hasher.hexdigest()
+
+def _execute_command(command: Sequence[str], directory: str,
+                     output_file: Optional[str] = None,
+                     cache_dir: Optional[str] = None) -> CommandResult:
+    """Run a single compilation command and collect output.
+
+    Module-level (rather than a Builder method) so it can be pickled and
+    dispatched to worker processes.
+
+    When cache_dir is given, the object file is looked up in (and stored to)
+    a ccache-style content-hash cache, so unchanged sources skip the
+    compiler entirely on repeat builds.
+
+    Args:
+        command: Full command as list of strings
+        directory: Directory to run the command in
+        output_file: Object file the command produces (used for caching)
+        cache_dir: Optional directory for the content-hash object cache
+
+    Returns:
+        CommandResult with output, timing, and status
+    """
+    result = CommandResult()
+
+    cache_key = None
+    if cache_dir and output_file:
+        start_time = time.time()
+        cache_key = _compile_cache_key(command, output_file)
+        if cache_key:
+            cached_obj = os.path.join(cache_dir, f"{cache_key}.o")
+            if os.path.exists(cached_obj):
+                shutil.copyfile(cached_obj, output_file)
+                result.succeeded = True
+                result.duration = time.time() - start_time
+                return result
+
+    try:
+        start_time = time.time()
+        # Plain Popen without shell/preexec_fn and with an explicit DEVNULL
+        # stdin keeps CPython on its posix_spawn/vfork fast path, avoiding
+        # a full fork of the (large) parent address space per job
+        process = subprocess.Popen(
+            command,  # Pass command list directly
+            shell=False,  # Set shell=False when using command list
+            cwd=directory,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        stdout, stderr = process.communicate()
+        result.duration = time.time() - start_time
+        # Skip the decode entirely for quiet compiles; tolerate non-UTF-8
+        # compiler output rather than failing the whole job
+        result.stdout = stdout.decode('utf-8', 'replace') if stdout else ''
+        result.stderr = stderr.decode('utf-8', 'replace') if stderr else ''
+
+        if process.returncode == 0:
+            result.succeeded = True
+        else:
+            result.succeeded = False
+            result.error = f"Command failed with return code {process.returncode}"
+
+        # Store the object in the cache for future builds
+        if result.succeeded and cache_key and output_file and os.path.exists(output_file):
+            ensure_dir(cache_dir)
+            shutil.copyfile(output_file, os.path.join(cache_dir, f"{cache_key}.o"))
+
+    except Exception as e:
+        result.succeeded = False
+        result.error = str(e)
+
+    return result
+
+class CompilerDaemonPool:
+    """Pool of persistent worker processes for running compile commands.
+
+    The workers are spawned once and stay resident for the lifetime of the
+    pool, so repeated compile phases reuse warm processes instead of paying
+    interpreter startup per batch of jobs. Workers are only spawned on the
+    first submit, so creating the pool is free.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, cmd: CompileCommand, cache_dir: Optional[str] = None):
+        """Submit a compile command, returning a Future of CommandResult."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor.submit(_execute_command, cmd.command, cmd.directory,
+                                     cmd.output_file, cache_dir)
+
+    def shutdown(self) -> None:
+        """Shut down the worker processes, waiting for pending jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def cancel_pending(self) -> None:
+        """Cancel queued jobs and discard the workers.
+
+        Jobs already running finish; everything still queued is dropped.
+        The pool respawns workers on the next submit.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
 def _generate_cmake_config(step: 'GeneratedStep') -> None:
     """Generate a file using CMake-style configuration."""
-    from .cmake_configure import cmake_configure_file
     cmake_configure_file(
         template_path=step.template,
         output_path=step.output,
@@ -59,10 +340,8 @@ def _generate_cmake_config(step: 'GeneratedStep') -> None:
 
 def _generate_copy(step: 'GeneratedStep') -> None:
     """Simply copy the template to output."""
-    with open(step.template, 'r') as f:
-        template_content = f.read()
-    with open(step.output, 'w') as f:
-        f.write(template_content)
+    # copyfile moves the bytes in the kernel where the platform supports it
+    shutil.copyfile(step.template, step.output)
 
 # Map of generator types to their implementation functions
 GENERATORS: Dict[str, Callable[['GeneratedStep'], None]] = {
@@ -165,10 +444,12 @@ class Builder:
     4. Archive phase - create static libraries from object files
     """
     
-    def __init__(self, toolchain: Toolchain, gen_dir: str, obj_dir: str, lib_dir: str, 
-                 tmp_dir: str, compile_commands_path: Optional[str] = None,
+    def __init__(self, toolchain: Toolchain, gen_dir: str, obj_dir: str, lib_dir: str,
+                 tmp_dir: Optional[str] = None, compile_commands_path: Optional[str] = None,
                  output_archive: Optional[str] = None,
-                 target_options: Optional[dict] = None):
+                 target_options: Optional[dict] = None,
+                 cache_dir: Optional[str] = None,
+                 fail_fast: bool = True):
         """Initialize builder with toolchain and output directories.
         
         Args:
@@ -176,24 +457,37 @@ class Builder:
             gen_dir: Directory for generated files
             obj_dir: Directory for object files
             lib_dir: Directory for library files
-            tmp_dir: Directory for temporary files
+            tmp_dir: Directory for temporary files (default: "tmp" beside obj_dir)
             compile_commands_path: Optional path to write compile_commands.json
             output_archive: Optional name for a single output archive that overrides target archives
             target_options: Optional dictionary of options used when loading all targets
+            cache_dir: Optional directory for the content-hash object cache;
+                when set, unchanged sources reuse cached object files
+            fail_fast: Stop dispatching new compilations after the first
+                failure (default True); archiving cannot proceed anyway
         """
         self.toolchain = toolchain
         self.gen_dir = gen_dir
         self.obj_dir = obj_dir
         self.lib_dir = lib_dir
-        self.tmp_dir = tmp_dir
+        self.tmp_dir = tmp_dir if tmp_dir is not None \
+            else os.path.join(os.path.dirname(obj_dir) or ".", "tmp")
         self.compile_commands_path = compile_commands_path
         self.output_archive = output_archive
         self.target_options = target_options or {}
+        self.cache_dir = cache_dir
+        self.fail_fast = fail_fast
         self.compile_tasks: List[CompileTask] = []
         self.archive_tasks: List[ArchiveTask] = []
         self._tasks: Dict[str, CompileTask] = {}  # Maps target names to compile tasks
+        self._closure_cache: Dict[str, tuple] = {}  # Memoized public include/definition closures
+        self._include_dir_cache: Dict[tuple, List[str]] = {}  # Memoized get_all_include_dirs results
+        self._last_setup_key: Optional[tuple] = None  # Fingerprint of the last completed setup
         self.total_compile_time: float = 0.0  # Total wall-clock time for parallel compilation
         self.feature_tests: Set[FeatureTestTask] = set()  # Unique feature tests
+        self._daemon_pool = CompilerDaemonPool()  # Persistent compile workers
+        self._archive_executor: Optional[ThreadPoolExecutor] = None  # Shared archiver threads
+        self._eager_archives: Dict[int, Any] = {}  # id(archive) -> future for archives started early
 
     def add_target(self, target: Target) -> None:
         """Add a target to be built.
@@ -205,15 +499,19 @@ class Builder:
             target: Target configuration
         """
         task = CompileTask(target=target)
-        
+        self._last_setup_key = None  # New target invalidates the setup fingerprint
+        self._include_dir_cache.clear()  # New target may extend existing closures
+
         # Get library name from target output or name
         lib_name = target.output if target.output else target.name
         
         # Add extension and prefix from toolchain
         lib_name = f"{self.toolchain.lib_prefix}{lib_name}{self.toolchain.lib_extension}"
         
-        # Set library path
-        task.lib_path = os.path.join(self.lib_dir, lib_name)
+        # Set library path; plain concatenation is enough since lib_name
+        # is a bare filename, and _setup_archive_tasks normalizes the
+        # path once at the boundary anyway
+        task.lib_path = f"{self.lib_dir}{os.sep}{lib_name}"
         
         # Add to compile tasks list
         self.compile_tasks.append(task)
@@ -242,12 +540,33 @@ class Builder:
         if not os.path.exists(script_path):
             return
         
-        # Import the build script module
+        # Import the build script module. Loading by path bypasses the
+        # regular import system's bytecode cache, so maintain a .pyc next to
+        # the script ourselves and load it when it is still fresh, skipping
+        # the re-parse of the source on every build.
         script_dir = os.path.dirname(os.path.abspath(script_path))
-        spec = importlib.util.spec_from_file_location("build_config", script_path)
+        cache_path = importlib.util.cache_from_source(script_path)
+        try:
+            cache_is_fresh = os.path.getmtime(cache_path) >= os.path.getmtime(script_path)
+        except OSError:
+            cache_is_fresh = False
+
+        if not cache_is_fresh:
+            try:
+                py_compile.compile(script_path, cfile=cache_path, doraise=True)
+                cache_is_fresh = True
+            except (py_compile.PyCompileError, OSError):
+                # Fall back to source loading; compile errors surface there
+                cache_is_fresh = False
+
+        if cache_is_fresh:
+            loader = importlib.machinery.SourcelessFileLoader("build_config", cache_path)
+            spec = importlib.util.spec_from_file_location("build_config", cache_path, loader=loader)
+        else:
+            spec = importlib.util.spec_from_file_location("build_config", script_path)
         if not spec or not spec.loader:
             raise ImportError(f"Could not load build script: {script_path}")
-        
+
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
         
@@ -311,20 +630,16 @@ class Builder:
         This builds a dependency graph and ensures all dependencies are satisfied,
         regardless of the order in which tasks were added.
         """
-        # First pass: collect all available target names
-        available_targets = {task.target.name for task in self.compile_tasks}
-        
-        # Second pass: validate all dependencies exist
-        for task in self.compile_tasks:
-            for dep_name in task.target.dependencies:
-                if dep_name not in available_targets:
-                    raise ValueError(f"Target {task.target.name} depends on {dep_name} which does not exist")
-        
-        # Third pass: resolve dependencies for each task
+        # Rebuild the name -> task map so lookups are O(1)
+        self._tasks = {task.target.name: task for task in self.compile_tasks}
+
+        # Resolve dependencies for each task
         for task in self.compile_tasks:
             task.dependencies = []
             for dep_name in task.target.dependencies:
-                dep_task = next(t for t in self.compile_tasks if t.target.name == dep_name)
+                dep_task = self._tasks.get(dep_name)
+                if dep_task is None:
+                    raise ValueError(f"Target {task.target.name} depends on {dep_name} which does not exist")
                 task.dependencies.append(dep_task)
 
     def _setup_all_tasks(self) -> None:
@@ -332,7 +647,17 @@ class Builder:
         
         First sets up all compile tasks with their includes, definitions, and commands.
         Then groups compile tasks by output library and creates archive tasks.
+
+        Repeat invocations on an unchanged target set (watch-mode
+        rebuilds, test drivers) are skipped via a graph fingerprint.
         """
+        key = self._setup_fingerprint()
+        if key == self._last_setup_key:
+            return
+
+        # Closures depend on the current target set, so recompute from scratch
+        self._closure_cache.clear()
+
         # First set up includes, definitions and commands
         for task in self.compile_tasks:
             print(f"- {task.target.name} target")
@@ -359,63 +684,104 @@ class Builder:
         # Then set up archive tasks
         print("\nSetting up archive tasks...")
         self._setup_archive_tasks()
+        self._last_setup_key = key
+
+    def _setup_fingerprint(self) -> tuple:
+        """Fingerprint of everything _setup_all_tasks derives its work from.
+
+        Covers target metadata and the builder's directory layout; a
+        matching fingerprint means a rerun would recompute identical
+        tasks.
+        """
+        return (self.gen_dir, self.obj_dir, self.lib_dir) + tuple(sorted(
+            (t.name, t.root, t.output or "",
+             tuple(t.sources), tuple(t.dependencies),
+             tuple(t.include_dirs), tuple(t.private_include_dirs),
+             tuple(t.definitions), tuple(t.private_definitions),
+             tuple((g.template, g.output, g.type) for g in t.generated_files))
+            for t in (task.target for task in self.compile_tasks)))
+
+    @property
+    def compile_tasks_by_name(self) -> Dict[str, CompileTask]:
+        """Compile tasks indexed by target name for O(1) lookup.
+
+        Exposes the index maintained by add_target; prefer this over
+        scanning compile_tasks when resolving a task by name.
+        """
+        return self._tasks
+
+    def _expand_include_dirs(self, dirs: List[str], target: Target) -> List[str]:
+        """Expand path variables and normalize a list of include directories.
 
-    def _setup_task_includes_and_definitions(self, task: CompileTask, visited: Optional[set] = None):
+        Args:
+            dirs: Include directories, absolute or relative to the target root
+            target: Target context for variable expansion
+
+        Returns:
+            List of absolute, normalized include paths
+        """
+        expanded = []
+        for inc in dirs:
+            expanded_inc = self._expand_target_path_vars(inc, target)
+            expanded.append(_norm_abs(expanded_inc, target.root))
+        return expanded
+
+    def _target_public_closure(self, task: CompileTask, _stack: Optional[set] = None) -> tuple:
+        """Compute the transitive public (include_dirs, definitions) closure.
+
+        Results are memoized by target name, so each target's closure is
+        computed once regardless of how many dependents pull it in. The
+        target's own entries come first, followed by each dependency's
+        closure in declaration order, deduplicated while preserving order.
+
+        Args:
+            task: The task to compute the closure for
+            _stack: Targets on the current DFS path, to prevent cycles (internal use)
+
+        Returns:
+            Tuple of (include_dirs tuple, definitions tuple)
+        """
+        name = task.target.name
+        cached = self._closure_cache.get(name)
+        if cached is not None:
+            return cached
+
+        if _stack is None:
+            _stack = set()
+        if name in _stack:
+            return ((), ())  # Break dependency cycles
+        _stack.add(name)
+
+        # Ordered-set merge: dict keys preserve insertion order
+        includes = dict.fromkeys(self._expand_include_dirs(task.target.include_dirs, task.target))
+        definitions = dict.fromkeys(task.target.definitions)
+
+        for dep_name in task.target.dependencies:
+            dep_task = self._tasks.get(dep_name)
+            if dep_task:
+                dep_includes, dep_definitions = self._target_public_closure(dep_task, _stack)
+                includes.update(dict.fromkeys(dep_includes))
+                definitions.update(dict.fromkeys(dep_definitions))
+
+        result = (tuple(includes), tuple(definitions))
+        self._closure_cache[name] = result
+        return result
+
+    def _setup_task_includes_and_definitions(self, task: CompileTask):
         """Set up include directories and definitions for a task.
         Resolves all includes and definitions, including those from dependencies.
-        
+
         Args:
             task: The task to set up
-            visited: Set of already visited targets to prevent cycles (internal use)
         """
-        if visited is None:
-            visited = set()
-            
-        # Prevent cycles in dependency graph
-        if task.target.name in visited:
-            return
-        visited.add(task.target.name)
-        
-        # Add target's own includes
-        for inc in task.target.include_dirs:
-            expanded_inc = self._expand_target_path_vars(inc, task.target)
-            if os.path.isabs(expanded_inc):
-                include_path = expanded_inc
-            else:
-                include_path = os.path.join(task.target.root, expanded_inc)
-            # Make absolute and normalize
-            include_path = normalize_path(os.path.abspath(include_path))
-            task.public_include_dirs.append(include_path)
-        
-        for inc in task.target.private_include_dirs:
-            expanded_inc = self._expand_target_path_vars(inc, task.target)
-            if os.path.isabs(expanded_inc):
-                include_path = expanded_inc
-            else:
-                include_path = os.path.join(task.target.root, expanded_inc)
-            # Make absolute and normalize
-            include_path = normalize_path(os.path.abspath(include_path))
-            task.private_include_dirs.append(include_path)
-        
-        # Add target's own definitions
-        task.public_definitions.extend(task.target.definitions)
-        task.private_definitions.extend(task.target.private_definitions)
-        
-        # Process dependencies after own includes/definitions
-        for dep_name in task.target.dependencies:
-            dep_task = next((t for t in self.compile_tasks if t.target.name == dep_name), None)
-            if dep_task:
-                # Recursively set up dependency if not already done
-                self._setup_task_includes_and_definitions(dep_task, visited)
-                # Collect public includes and definitions from dependency
-                task.public_include_dirs.extend(dep_task.public_include_dirs)
-                task.public_definitions.extend(dep_task.public_definitions)
-        
-        # Remove duplicates while preserving order
-        task.public_include_dirs = list(dict.fromkeys(task.public_include_dirs))
-        task.private_include_dirs = list(dict.fromkeys(task.private_include_dirs))
-        task.public_definitions = list(dict.fromkeys(task.public_definitions))
-        task.private_definitions = list(dict.fromkeys(task.private_definitions))
+        public_includes, public_definitions = self._target_public_closure(task)
+        task.public_include_dirs = list(public_includes)
+        task.public_definitions = list(public_definitions)
+
+        # Private entries apply only to this target
+        task.private_include_dirs = list(dict.fromkeys(
+            self._expand_include_dirs(task.target.private_include_dirs, task.target)))
+        task.private_definitions = list(dict.fromkeys(task.target.private_definitions))
 
     def _create_commands(self, task: CompileTask):
         """Create compilation commands for a task.
@@ -426,41 +792,50 @@ class Builder:
         """
         task.commands.clear()
         task.obj_files.clear()
-        
+
+        # Object directory is the same for every source in the task
+        target_obj_dir = os.path.join(self.obj_dir, task.target.name)
+
+        # Include directories (public and private) and definitions are
+        # identical for every source in the task, so format them once
+        include_flags = [f"-I{dir}" for dir in task.public_include_dirs + task.private_include_dirs]
+        define_flags = [f"-D{define}" for define in task.public_definitions + task.private_definitions]
+
+        # Per-language command prefixes, shared by all sources in the task.
+        # A ccache/sccache wrapper found on PATH is prepended transparently
+        # (it also shows up in compile_commands.json, which consumers accept);
+        # skipped when the configured compiler already is such a wrapper
+        cache_exe = _detect_compile_cache()
+        wrap = [cache_exe] if cache_exe and os.path.basename(
+            self.toolchain.cc[0]) not in ("ccache", "sccache") else []
+        c_prefix = [*wrap, *self.toolchain.cc, *self.toolchain.cflags,
+                    *include_flags, *define_flags]
+        cxx_prefix = [*wrap, *self.toolchain.cxx, *self.toolchain.cxxflags,
+                      *include_flags, *define_flags]
+
         for source in task.target.sources:
             # Convert source path to absolute and normalize
-            if os.path.isabs(source):
-                src_path = source
-            else:
-                src_path = os.path.join(task.target.root, source)
-            src_path = normalize_path(os.path.abspath(src_path))
-            
+            src_path = _norm_abs(source, task.target.root)
+
             # Form object file path within obj_dir
             rel_path = os.path.relpath(src_path, task.target.root)
-            target_obj_dir = os.path.join(self.obj_dir, task.target.name)
             obj_path = os.path.join(target_obj_dir, os.path.splitext(rel_path)[0] + ".o")
             # Normalize obj path
             obj_path = normalize_path(obj_path)
-            
+
             # Choose compiler and flags based on file extension
-            is_cpp = os.path.splitext(source)[1].lower() in ['.cpp', '.cxx', '.cc']
-            compiler = self.toolchain.cxx if is_cpp else self.toolchain.cc
-            flags = self.toolchain.cxxflags if is_cpp else self.toolchain.cflags
-            
-            # Use all include directories (both public and private)
-            include_flags = [f"-I{dir}" for dir in task.public_include_dirs + task.private_include_dirs]
-            
-            # Use all definitions (both public and private)
-            define_flags = [f"-D{define}" for define in task.public_definitions + task.private_definitions]
-            
-            # Build command as list
-            cmd = compiler + flags + include_flags + define_flags + [
+            is_cpp = os.path.splitext(source)[1].lower() in _CPP_EXTENSIONS
+
+            # Build command as list; -MD -MF records included headers in a
+            # sibling depfile so unchanged files can be skipped next build
+            cmd = (cxx_prefix if is_cpp else c_prefix) + [
+                "-MD", "-MF", obj_path + ".d",
                 "-o", obj_path, src_path
             ]
             
             task.commands.append(CompileCommand(
                 directory=os.path.dirname(obj_path),
-                command=cmd,  # Store as list
+                command=tuple(cmd),  # Immutable; pickles faster to workers
                 source_file=src_path,
                 output_file=obj_path
             ))
@@ -498,7 +873,7 @@ class Builder:
                 obj_files.extend(task.obj_files)
                 
             # Create archive command as list
-            command = self.toolchain.ar + self.toolchain.arflags + [lib_path] + obj_files
+            command = [*self.toolchain.ar, *self.toolchain.arflags, lib_path, *obj_files]
             
             # Create archive task
             archive = ArchiveTask(
@@ -519,51 +894,186 @@ class Builder:
         # If there are no commands, nothing to do
         if not all_commands:
             return True  # No failures if there is nothing to compile
-        
+
+        # Skip files whose object is newer than the source and every header
+        # recorded in the depfile from the previous build
+        pending_commands = []
+        for cmd in all_commands:
+            if _is_up_to_date(cmd):
+                cmd.result = CommandResult(succeeded=True, duration=0.0)
+            else:
+                pending_commands.append(cmd)
+        n_skipped = len(all_commands) - len(pending_commands)
+
+        if not pending_commands:
+            print(f"\nAll {len(all_commands)} files up to date")
+            for task in self.compile_tasks:
+                task.succeeded = all(cmd.result and cmd.result.succeeded for cmd in task.commands)
+            return True
+
+        # Group commands that compile the same source with the same flags
+        # (only the object/depfile paths differ): compile once per group and
+        # replicate the object into the other outputs afterwards
+        dedup_groups: Dict[tuple, List[CompileCommand]] = {}
+        for cmd in pending_commands:
+            key = tuple(arg for arg in cmd.command if cmd.output_file not in arg)
+            dedup_groups.setdefault(key, []).append(cmd)
+
+        primary_commands = [group[0] for group in dedup_groups.values()]
+        duplicate_map = {id(group[0]): group[1:]
+                         for group in dedup_groups.values() if len(group) > 1}
+        n_shared = len(pending_commands) - len(primary_commands)
+
         # Calculate formatting widths for printing
-        total_commands = len(all_commands)
+        total_commands = len(primary_commands)
         counter_width = len(str(total_commands))
-        max_filename_len = max(len(os.path.basename(cmd.source_file)) for cmd in all_commands)
+        max_filename_len = max(len(cmd.source_basename) for cmd in primary_commands)
         filename_width = min(max(max_filename_len + 2, 25), 40)
 
-        print(f"\nCompiling {total_commands} files...")
+        skipped_notes = []
+        if n_skipped:
+            skipped_notes.append(f"{n_skipped} up to date")
+        if n_shared:
+            skipped_notes.append(f"{n_shared} shared")
+        if skipped_notes:
+            print(f"\nCompiling {total_commands} files ({', '.join(skipped_notes)})...")
+        else:
+            print(f"\nCompiling {total_commands} files...")
 
         n_failed = 0
         start_time = time.time()
 
-        # Map each future to its corresponding command for efficient lookup
-        future_to_cmd = {}
-        # You can specify max_workers if needed, e.g., ThreadPoolExecutor(max_workers=8)
-        with ThreadPoolExecutor() as executor:
-            for cmd in all_commands:
-                future = executor.submit(self._execute_command, cmd)
-                future_to_cmd[future] = cmd
+        # Create each unique output directory once on the main thread; many
+        # commands share a directory, and doing it here keeps per-job
+        # makedirs syscalls out of the workers
+        for directory in {cmd.directory for cmd in pending_commands}:
+            os.makedirs(directory, exist_ok=True)
 
-            completed = 0
-            for future in as_completed(future_to_cmd):
-                completed += 1
-                cmd = future_to_cmd[future]
+        # Submit the biggest sources first: file size is a decent proxy for
+        # compile time, and starting long-pole jobs early keeps the tail of
+        # the schedule short
+        def source_size(cmd: CompileCommand) -> int:
+            try:
+                return os.path.getsize(cmd.source_file)
+            except OSError:
+                return 0
+        primary_commands.sort(key=source_size, reverse=True)
 
-                try:
-                    result = future.result()
-                    cmd.result = result
+        # Track how many pending commands each task still has, so archives
+        # can start as soon as all of their inputs are compiled
+        self._eager_archives.clear()
+        cmd_to_task: Dict[int, CompileTask] = {}
+        task_pending: Dict[int, int] = {id(task): 0 for task in self.compile_tasks}
+        for task in self.compile_tasks:
+            for c in task.commands:
+                cmd_to_task[id(c)] = task
+        for cmd in pending_commands:
+            task_pending[id(cmd_to_task[id(cmd)])] += 1
 
-                    # Print status if we have a result
-                    if result is not None:
-                        status = "succeeded" if result.succeeded else "failed"
-                        filename = os.path.basename(cmd.source_file)
-                        print(f"[{completed:{counter_width}d}/{total_commands}]  "
-                            f"{filename:<{filename_width}} ... {status} ({result.duration:.1f}s)")
+        def archive_ready(archive: ArchiveTask) -> bool:
+            """All inputs compiled (successfully) for this archive?"""
+            for task in archive.compile_tasks:
+                if task_pending[id(task)] > 0:
+                    return False
+                if not all(c.result and c.result.succeeded for c in task.commands):
+                    return False
+            return True
 
-                    if not result.succeeded:
-                        n_failed += 1
+        def start_ready_archives():
+            """Eagerly archive any library whose compiles are all done."""
+            for archive in self.archive_tasks:
+                if id(archive) in self._eager_archives:
+                    continue
+                if archive_ready(archive):
+                    if self._archive_executor is None:
+                        self._archive_executor = ThreadPoolExecutor(
+                            max_workers=min(8, len(self.archive_tasks)))
+                    self._eager_archives[id(archive)] = \
+                        self._archive_executor.submit(self._run_archive, archive)
 
-                except Exception as e:
-                    # If there's an exception, mark this command as failed and log the error
-                    print(f"Error executing {cmd.source_file}: {e}")
-                    cmd.result = CommandResult(succeeded=False, error=str(e))
+        # Jobs go through the persistent daemon pool so workers stay warm
+        # across compile phases instead of re-spawning per batch. The command
+        # rides along on its future, avoiding a parallel future->cmd dict.
+        futures = []
+        for cmd in primary_commands:
+            future = self._daemon_pool.submit(cmd, self.cache_dir)
+            future.cmd = cmd
+            futures.append(future)
+
+        # Buffer progress lines and flush in batches so the completion loop
+        # isn't throttled by stdio locking under heavy parallelism
+        line_fmt = (f"[{{:{counter_width}d}}/{total_commands}]  "
+                    f"{{:<{filename_width}}} ... {{}} ({{:.1f}}s)\n")
+        print_buffer: List[str] = []
+        last_flush = time.monotonic()
+
+        def flush_progress():
+            nonlocal last_flush
+            if print_buffer:
+                sys.stdout.write("".join(print_buffer))
+                sys.stdout.flush()
+                print_buffer.clear()
+            last_flush = time.monotonic()
+
+        completed = 0
+        for future in as_completed(futures):
+            completed += 1
+            cmd = future.cmd
+
+            try:
+                result = future.result()
+                cmd.result = result
+
+                # Propagate the result to commands sharing this compilation
+                task_pending[id(cmd_to_task[id(cmd)])] -= 1
+                for dup in duplicate_map.get(id(cmd), ()):
+                    if result.succeeded:
+                        _replicate_object(cmd, dup)
+                        dup.result = CommandResult(succeeded=True, duration=0.0)
+                    else:
+                        dup.result = result
+                    task_pending[id(cmd_to_task[id(dup)])] -= 1
+
+                # Overlap archiving with the remaining compiles
+                if result.succeeded:
+                    start_ready_archives()
+
+                # Queue status line if we have a result
+                if result is not None:
+                    status = "succeeded" if result.succeeded else "failed"
+                    print_buffer.append(line_fmt.format(completed, cmd.source_basename, status, result.duration))
+
+                if not result.succeeded:
                     n_failed += 1
 
+            except Exception as e:
+                # If there's an exception, mark this command as failed and log the error
+                print_buffer.append(f"Error executing {cmd.source_file}: {e}\n")
+                cmd.result = CommandResult(succeeded=False, error=str(e))
+                task_pending[id(cmd_to_task[id(cmd)])] -= 1
+                for dup in duplicate_map.get(id(cmd), ()):
+                    dup.result = cmd.result
+                    task_pending[id(cmd_to_task[id(dup)])] -= 1
+                n_failed += 1
+
+            # Stop feeding the pool once something failed: the archive
+            # phase cannot succeed, so remaining compiles are wasted work
+            if self.fail_fast and n_failed:
+                print_buffer.append("Stopping remaining compilations after failure\n")
+                flush_progress()
+                self._daemon_pool.cancel_pending()
+                break
+
+            if len(print_buffer) >= 50 or time.monotonic() - last_flush >= 0.1:
+                flush_progress()
+
+        flush_progress()
+
+        # Mark commands that never ran due to fail-fast cancellation
+        for cmd in pending_commands:
+            if cmd.result is None:
+                cmd.result = CommandResult(succeeded=False, error="Cancelled after earlier failure")
+
         self.total_compile_time = time.time() - start_time
 
         # Update each task's success state
@@ -574,35 +1084,25 @@ class Builder:
         return n_failed == 0
 
 
-    def _execute_command(self, cmd: CompileCommand) -> CommandResult:
-        """Run single compilation command and collect output"""
+    def _run_archive(self, archive: ArchiveTask) -> CommandResult:
+        """Run a single archive command and populate its result."""
         result = CommandResult()
-        ensure_dir(cmd.directory)
-        
         try:
+            ensure_dir(os.path.dirname(archive.output_file))
             start_time = time.time()
             process = subprocess.run(
-                cmd.command,  # Pass command list directly
-                shell=False,  # Set shell=False when using command list
-                cwd=cmd.directory,
+                archive.command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE
             )
             result.duration = time.time() - start_time
-            result.stdout = process.stdout.decode('utf-8')
-            result.stderr = process.stderr.decode('utf-8')
-            
-            if process.returncode == 0:
-                result.succeeded = True
-            else:
-                result.succeeded = False
-                result.error = f"Command failed with return code {process.returncode}"
-                
+            result.stdout = process.stdout.decode('utf-8', 'replace') if process.stdout else ''
+            result.stderr = process.stderr.decode('utf-8', 'replace') if process.stderr else ''
+            result.succeeded = process.returncode == 0
         except Exception as e:
             result.succeeded = False
             result.error = str(e)
-            
-        cmd.result = result
+        archive.result = result
         return result
 
     def _execute_archive_tasks(self):
@@ -617,54 +1117,63 @@ class Builder:
         libname_width = min(max(max_libname_len + 2, 25), 40)
 
         print(f"\nArchiving {total_archives} libraries...")
-        
+
         n_failed = 0
-            
-        for i, archive in enumerate(self.archive_tasks, 1):
+        completed = 0
+
+        # Report archives whose compilation failed without running the archiver
+        runnable = []
+        for archive in self.archive_tasks:
             lib_name = os.path.basename(archive.output_file)
-            result = CommandResult()
-            
-            # Skip if compilation failed
             if not all(task.succeeded for task in archive.compile_tasks):
+                completed += 1
+                result = CommandResult()
                 result.succeeded = False
                 result.error = f"Cannot create {lib_name} - compilation failed"
                 archive.result = result
-                print(f"[{i:{counter_width}d}/{total_archives}]  {lib_name:<{libname_width}} ... failed (compilation failed)")
+                print(f"[{completed:{counter_width}d}/{total_archives}]  {lib_name:<{libname_width}} ... failed (compilation failed)")
                 n_failed += 1
-                continue
-                
-            try:
-                ensure_dir(os.path.dirname(archive.output_file))
-                start_time = time.time()
-                process = subprocess.run(
-                    archive.command,
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE
-                )
-                result.duration = time.time() - start_time
-                result.stdout = process.stdout.decode('utf-8')
-                result.stderr = process.stderr.decode('utf-8')
-                result.succeeded = process.returncode == 0
-                archive.result = result
-                
-                status = "succeeded" if result.succeeded else "failed"
-                print(f"[{i:{counter_width}d}/{total_archives}]  {lib_name:<{libname_width}} ... {status} ({result.duration:.1f}s)")
-                
+            else:
+                runnable.append(archive)
+
+        # Archives for different libraries are independent, so run them in
+        # parallel; ar is mostly I/O-bound, so threads are enough. Archives
+        # started eagerly during the compile phase are awaited, not re-run.
+        if runnable:
+            if self._archive_executor is None:
+                self._archive_executor = ThreadPoolExecutor(
+                    max_workers=min(8, len(self.archive_tasks)))
+            future_to_archive = {}
+            for archive in runnable:
+                future = self._eager_archives.get(id(archive))
+                if future is None:
+                    future = self._archive_executor.submit(self._run_archive, archive)
+                future_to_archive[future] = archive
+            for future in as_completed(future_to_archive):
+                archive = future_to_archive[future]
+                lib_name = os.path.basename(archive.output_file)
+                completed += 1
+
+                try:
+                    result = future.result()
+
+                    status = "succeeded" if result.succeeded else "failed"
+                    print(f"[{completed:{counter_width}d}/{total_archives}]  {lib_name:<{libname_width}} ... {status} ({result.duration:.1f}s)")
+
+                    if not result.succeeded:
+                        print(f"Error: {result.error}")
+                        if result.stdout:
+                            print("stdout:", result.stdout)
+                        if result.stderr:
+                            print("stderr:", result.stderr)
+
+                except Exception as e:
+                    print(f"Error creating {lib_name}: {e}")
+                    result = CommandResult(succeeded=False, error=str(e))
+                    archive.result = result
+
                 if not result.succeeded:
-                    print(f"Error: {result.error}")
-                    if result.stdout:
-                        print("stdout:", result.stdout)
-                    if result.stderr:
-                        print("stderr:", result.stderr)
-                    
-            except Exception as e:
-                print(f"Error creating {lib_name}: {e}")
-                result.succeeded = False
-                result.error = str(e)
-                archive.result = result
-                
-            if not result.succeeded:
-                n_failed += 1
+                    n_failed += 1
         
         # Print summary
         if n_failed:
@@ -684,12 +1193,8 @@ class Builder:
         Returns:
             Path with all variables expanded
         """
-        # Replace ${gen} with target's generated files directory
-        if "${gen}" in path:
-            gen_dir = os.path.join(self.gen_dir, target.name)
-            path = path.replace("${gen}", gen_dir)
-        
-        return path
+        # The expansion is memoized per target, see Target._expand_path_vars
+        return target._expand_path_vars(path, self)
 
     def _generate_files(self):
         """Generate all files from templates."""
@@ -708,26 +1213,31 @@ class Builder:
         max_filename_len = max(len(os.path.basename(f.output)) for f in all_steps)
         filename_width = min(max(max_filename_len + 2, 25), 40)
 
+        # Merge feature test results into definitions before submission
+        for step in all_steps:
+            if step.type == "cmake_configure":
+                # Find all feature tests that affect this target
+                target_name = os.path.relpath(os.path.dirname(step.output), self.gen_dir)
+                for test in self.feature_tests:
+                    if target_name in test.requesting_targets:
+                        step.definitions[test.variable] = test.result
+
+        # Generation steps are independent I/O plus small templating,
+        # so run them concurrently; threads suffice and avoid pickling
         n_failed = 0
-        for i, step in enumerate(all_steps, 1):
-            filename = os.path.basename(step.output)
-            try:
-                # Merge feature test results into definitions
-                if step.type == "cmake_configure":
-                    # Find all feature tests that affect this target
-                    target_name = os.path.relpath(os.path.dirname(step.output), self.gen_dir)
-                    for test in self.feature_tests:
-                        if target_name in test.requesting_targets:
-                            step.definitions[test.variable] = test.result
-                
-                # Execute generation
-                step.generate()
-                print(f"[{i:{counter_width}d}/{len(all_steps)}]  {filename:<{filename_width}} ... succeeded ({step.duration:.1f}s)")
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2)) as executor:
+            future_to_step = {executor.submit(step.generate): step for step in all_steps}
+            for i, future in enumerate(as_completed(future_to_step), 1):
+                step = future_to_step[future]
+                filename = os.path.basename(step.output)
+                try:
+                    future.result()
+                    print(f"[{i:{counter_width}d}/{len(all_steps)}]  {filename:<{filename_width}} ... succeeded ({step.duration:.1f}s)")
 
-            except Exception as e:
-                print(f"[{i:{counter_width}d}/{len(all_steps)}]  {filename:<{filename_width}} ... failed")
-                print(f"Error: {step.error}")
-                n_failed += 1
+                except Exception as e:
+                    print(f"[{i:{counter_width}d}/{len(all_steps)}]  {filename:<{filename_width}} ... failed")
+                    print(f"Error: {step.error}")
+                    n_failed += 1
 
         if n_failed:
             print(f"\n{n_failed} of {len(all_steps)} files failed to generate")
@@ -736,21 +1246,282 @@ class Builder:
             return True
 
     def _write_compile_commands(self):
-        """Write compile commands to compile_commands.json."""
-        compile_commands = []
-        for task in self.compile_tasks:
-            for command in task.commands:
-                compile_commands.append(command.to_json_dict())
-        
+        """Write compile commands to compile_commands.json.
+
+        Entries are streamed to the file one at a time instead of building
+        one large in-memory list, using orjson when it is installed.
+        """
+        if not self.compile_commands_path:
+            return
+
         # Create directory if it doesn't exist
-        if self.compile_commands_path:
-            os.makedirs(os.path.dirname(self.compile_commands_path), exist_ok=True)
-            # Write JSON file
-            with open(self.compile_commands_path, 'w') as f:
-                json.dump(compile_commands, f, indent=2)
+        os.makedirs(os.path.dirname(self.compile_commands_path), exist_ok=True)
+
+        if orjson is not None:
+            # orjson serializes the whole array in C and returns bytes
+            entries = [command.to_json_dict()
+                       for task in self.compile_tasks
+                       for command in task.commands]
+            data = orjson.dumps(entries, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        else:
+            # Stdlib fallback: join encoded entries
+            parts = [json.dumps(command.to_json_dict()).encode('utf-8')
+                     for task in self.compile_tasks
+                     for command in task.commands]
+            data = b"[\n" + b",\n".join(parts) + b"\n]\n"
+
+        # Skip the write when the content is unchanged so tools watching the
+        # file's mtime (clangd etc.) don't reindex on no-op builds
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        hash_path = self.compile_commands_path + ".hash"
+        try:
+            with open(hash_path, 'r') as f:
+                if f.read().strip() == digest:
+                    return
+        except OSError:
+            pass
+
+        # Write atomically so concurrent readers never see a partial file
+        tmp_path = self.compile_commands_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, self.compile_commands_path)
+        with open(hash_path, 'w') as f:
+            f.write(digest)
+
+    def _feature_test_content(self, test: FeatureTestTask) -> tuple:
+        """Generate probe source content and extra flags for a feature test.
+
+        Args:
+            test: The feature test to generate a probe for
+
+        Returns:
+            Tuple of (source content, extra compiler flags)
+
+        Raises:
+            ValueError: If the test is missing required fields or has an
+                unknown type
+        """
+        if test.type == "compiler_flag":
+            flags = [test.flag] if test.flag else []
+            return _COMPILER_FLAG_PROBE_SRC, flags
+
+        # All remaining test types include headers
+        if not hasattr(test, 'headers') or not test.headers:
+            raise ValueError(f"{test.type} test {test.variable} has no headers specified")
+        params = {"includes": includes_block(tuple(test.headers))}
+
+        if test.type == "header":
+            template = HEADER_TEST_TEMPLATE
+        elif test.type == "type":
+            if not hasattr(test, 'type_name') or not test.type_name:
+                raise ValueError(f"Type test {test.variable} has no type specified")
+            template = TYPE_TEST_TEMPLATE
+            params["type_name"] = test.type_name
+        elif test.type == "function":
+            if not hasattr(test, 'function') or not test.function:
+                raise ValueError(f"Function test {test.variable} has no function specified")
+            template = FUNCTION_TEST_TEMPLATE
+            params["function"] = test.function
+        elif test.type == "struct_member":
+            if not hasattr(test, 'struct_name') or not test.struct_name:
+                raise ValueError(f"Struct member test {test.variable} has no struct specified")
+            if not hasattr(test, 'member') or not test.member:
+                raise ValueError(f"Struct member test {test.variable} has no member specified")
+            template = STRUCT_MEMBER_TEST_TEMPLATE
+            params["struct_name"] = test.struct_name
+            params["member"] = test.member
+        else:
+            raise ValueError(f"Unknown test type: {test.type}")
+
+        # Render the template in one pass instead of chained .replace calls
+        return template.strip().format_map(params), []
+
+    def _feature_cache_key(self, test: FeatureTestTask,
+                           per_language: Dict[str, tuple]) -> Optional[str]:
+        """Compute a persistent cache key for a feature test.
+
+        Probes are hermetic: the same source, flags and compiler binary
+        always produce the same result, so the key hashes all three (the
+        compiler is represented by its resolved path and mtime).
+
+        Args:
+            test: The feature test to key
+            per_language: (compiler, base flags) per language, prebuilt by
+                the caller
+
+        Returns:
+            Hex digest key, or None if the test cannot be keyed (e.g. its
+            probe source cannot be generated)
+        """
+        try:
+            content, flags = self._feature_test_content(test)
+        except ValueError:
+            return None
+        compiler, base_flags = per_language[test.language]
+        exe, mtime = _compiler_fingerprint(compiler[0])
+        blob = "\0".join([test.type, content, exe, mtime, *compiler, *base_flags, *flags])
+        return hashlib.blake2b(blob.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _run_header_probe_batch(self, tests: List[FeatureTestTask], test_dir: str,
+                                per_language: Dict[str, tuple]) -> bool:
+        """Probe many header tests with one preprocessor invocation.
+
+        Emits a single source with a __has_include-guarded sentinel token
+        per test and scans the -E output for the sentinels, amortizing
+        process startup across the whole group.
+
+        Args:
+            tests: Header tests sharing the same language
+            test_dir: Scratch directory for probe sources
+            per_language: (compiler, base flags) per language, prebuilt by
+                the caller
+
+        Returns:
+            True if the batch ran and results were recorded; False if the
+            probe could not run (callers fall back to per-test compiles)
+        """
+        start_time = time.time()
+        is_cpp = tests[0].language == "c++"
+        ext = ".cpp" if is_cpp else ".c"
+        test_file = os.path.join(test_dir, f"test_headers_batch{ext}")
+
+        lines = []
+        for i, test in enumerate(tests):
+            condition = " && ".join(f"__has_include(<{header}>)" for header in test.headers)
+            lines.append(f"#if {condition}")
+            lines.append(f"BT_PROBE_{i}_OK")
+            lines.append("#endif")
+        with open(test_file, 'w') as f:
+            f.write("\n".join(lines))
+            f.write('\n')
+
+        compiler, base_flags = per_language[tests[0].language]
+
+        # -E overrides -c in the base flags; sentinels pass through untouched
+        cmd = [*compiler, *base_flags, "-E", test_file]
+        try:
+            # stdout carries the sentinels; diagnostics are not inspected
+            process = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except Exception:
+            return False
+        if process.returncode != 0:
+            return False
+
+        output = process.stdout.decode('utf-8', 'replace')
+        duration = (time.time() - start_time) / len(tests)
+        for i, test in enumerate(tests):
+            test.result = f"BT_PROBE_{i}_OK" in output
+            test.duration = duration
+        return True
+
+    def _run_flag_probe_batch(self, tests: List[FeatureTestTask],
+                              per_language: Dict[str, tuple]) -> bool:
+        """Probe many compiler-flag tests with one compile invocation.
+
+        Compiles the trivial probe once with every flag in the group and
+        bisects on failure, so N passing flags cost a single process and
+        mixed groups cost O(log N) extra compiles.
+
+        Args:
+            tests: Flag tests sharing the same language
+            per_language: (compiler, base flags) per language, prebuilt by
+                the caller
+
+        Returns:
+            True if the batch ran and results were recorded; False if the
+            probe could not run (callers fall back to per-test compiles)
+        """
+        language = tests[0].language
+        compiler, base_flags = per_language[language]
+        prefix = [*compiler, *base_flags]
+        probe_input = (_COMPILER_FLAG_PROBE_SRC + "\n").encode('utf-8')
+
+        def probe(group: List[FeatureTestTask]) -> None:
+            start = time.time()
+            cmd = [*prefix, *(t.flag for t in group), "-c",
+                   "-x", language, "-", "-o", os.devnull]
+            result = subprocess.run(cmd, input=probe_input,
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL)
+            duration = (time.time() - start) / len(group)
+            if result.returncode == 0:
+                for test in group:
+                    test.result = True
+                    test.duration += duration
+            elif len(group) == 1:
+                group[0].result = False
+                group[0].duration += duration
+            else:
+                for test in group:
+                    test.duration += duration
+                mid = len(group) // 2
+                probe(group[:mid])
+                probe(group[mid:])
+
+        try:
+            probe(list(tests))
+        except Exception:
+            return False
+        return True
+
+    def _run_feature_test(self, test: FeatureTestTask, test_dir: str,
+                          prefixes: Dict[str, List[str]]) -> None:
+        """Run a single feature test probe and record its result.
+
+        Args:
+            test: The feature test to run; result and duration are updated
+            test_dir: Scratch directory for probe sources and objects
+            prefixes: Compiler command prefix (executable + base flags) per
+                language, prebuilt by the caller
+        """
+        test_start_time = time.time()
+        try:
+            content, flags = self._feature_test_content(test)
+
+            # Run test compilation; only the exit code matters, so skip
+            # writing objects where the compiler allows it, and feed the
+            # source through stdin to avoid temp-file churn. MSVC gets the
+            # original on-disk compile (it would need /Zs and /Tc paths)
+            probe_input = None
+            if self.toolchain.compiler_id == "msvc":
+                ext = ".cpp" if test.language == "c++" else ".c"
+                test_file = os.path.join(test_dir, f"test_{test.variable}{ext}")
+                obj_file = os.path.join(test_dir, f"test_{test.variable}.o")
+                with open(test_file, 'w') as f:
+                    f.write(content)
+                    f.write('\n')  # Add trailing newline
+                cmd = [*prefixes[test.language], *flags, "-c", test_file, "-o", obj_file]
+            else:
+                probe_input = (content + "\n").encode('utf-8')
+                if test.type == "compiler_flag":
+                    # Flag probes must reach codegen to catch flags that
+                    # only fail later, but the object itself is disposable
+                    cmd = [*prefixes[test.language], *flags, "-c",
+                           "-x", test.language, "-", "-o", os.devnull]
+                else:
+                    cmd = [*prefixes[test.language], *flags, "-fsyntax-only",
+                           "-x", test.language, "-"]
+            # Only the exit code is inspected; discarding output saves the
+            # parent from buffering compiler diagnostics
+            result = subprocess.run(
+                cmd,
+                input=probe_input,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+
+            # Update test result
+            test.result = result.returncode == 0
+        finally:
+            test.duration = time.time() - test_start_time
 
     def _execute_feature_tests(self):
-        """Execute all feature tests in the scratch directory."""
+        """Execute all feature tests in the scratch directory.
+
+        Tests are independent probe compiles, so they run concurrently;
+        the hot path is subprocess.run (GIL-released), so threads suffice.
+        """
         if not self.feature_tests:
             return
 
@@ -767,135 +1538,148 @@ class Builder:
 
         n_failed = 0
         start_time = time.time()
-        for i, test in enumerate(sorted(self.feature_tests, key=lambda t: t.variable), 1):
-            try:
-                test_start_time = time.time()
-                # Create test file with appropriate extension
-                ext = ".cpp" if test.language == "c++" else ".c"
-                test_file = os.path.join(test_dir, f"test_{test.variable}{ext}")
-                obj_file = os.path.join(test_dir, f"test_{test.variable}.o")
-                
-                # Generate test file content based on test type
-                if test.type == "compiler_flag":
-                    from .feature import COMPILER_FLAG_TEST_TEMPLATE
-                    content = COMPILER_FLAG_TEST_TEMPLATE.strip()
-                    compiler = self.toolchain.cxx if test.language == "c++" else self.toolchain.cc
-                    flags = [test.flag] if test.flag else []
-                elif test.type == "header":
-                    from .feature import HEADER_TEST_TEMPLATE
-                    # Create include directives for each header
-                    if not hasattr(test, 'headers') or not test.headers:
-                        raise ValueError(f"Header test {test.variable} has no headers specified")
-                    includes = []
-                    for header in test.headers:
-                        includes.append(f"#include <{header}>")
-                    content = HEADER_TEST_TEMPLATE.strip().replace(
-                        "{includes}",
-                        "\n".join(includes)
-                    )
-                    compiler = self.toolchain.cxx if test.language == "c++" else self.toolchain.cc
-                    flags = []
-                elif test.type == "type":
-                    from .feature import TYPE_TEST_TEMPLATE
-                    # Create include directives for each header
-                    if not hasattr(test, 'headers') or not test.headers:
-                        raise ValueError(f"Type test {test.variable} has no headers specified")
-                    if not hasattr(test, 'type_name') or not test.type_name:
-                        raise ValueError(f"Type test {test.variable} has no type specified")
-                    includes = []
-                    for header in test.headers:
-                        includes.append(f"#include <{header}>")
-                    content = TYPE_TEST_TEMPLATE.strip().replace(
-                        "{includes}",
-                        "\n".join(includes)
-                    ).replace(
-                        "{type_name}",
-                        test.type_name
-                    )
-                    compiler = self.toolchain.cxx if test.language == "c++" else self.toolchain.cc
-                    flags = []
-                elif test.type == "function":
-                    from .feature import FUNCTION_TEST_TEMPLATE
-                    # Create include directives for each header
-                    if not hasattr(test, 'headers') or not test.headers:
-                        raise ValueError(f"Function test {test.variable} has no headers specified")
-                    if not hasattr(test, 'function') or not test.function:
-                        raise ValueError(f"Function test {test.variable} has no function specified")
-                    includes = []
-                    for header in test.headers:
-                        includes.append(f"#include <{header}>")
-                    content = FUNCTION_TEST_TEMPLATE.strip().replace(
-                        "{includes}",
-                        "\n".join(includes)
-                    ).replace(
-                        "{function}",
-                        test.function
-                    )
-                    compiler = self.toolchain.cxx if test.language == "c++" else self.toolchain.cc
-                    flags = []
-                elif test.type == "struct_member":
-                    from .feature import STRUCT_MEMBER_TEST_TEMPLATE
-                    # Create include directives for each header
-                    if not hasattr(test, 'headers') or not test.headers:
-                        raise ValueError(f"Struct member test {test.variable} has no headers specified")
-                    if not hasattr(test, 'struct_name') or not test.struct_name:
-                        raise ValueError(f"Struct member test {test.variable} has no struct specified")
-                    if not hasattr(test, 'member') or not test.member:
-                        raise ValueError(f"Struct member test {test.variable} has no member specified")
-                    includes = []
-                    for header in test.headers:
-                        includes.append(f"#include <{header}>")
-                    content = STRUCT_MEMBER_TEST_TEMPLATE.strip().replace(
-                        "{includes}",
-                        "\n".join(includes)
-                    ).replace(
-                        "{struct_name}",
-                        test.struct_name
-                    ).replace(
-                        "{member}",
-                        test.member
-                    )
-                    compiler = self.toolchain.cxx if test.language == "c++" else self.toolchain.cc
-                    flags = []
-                else:
-                    raise ValueError(f"Unknown test type: {test.type}")
-                
-                # Write test file
-                with open(test_file, 'w') as f:
-                    f.write(content)
-                    f.write('\n')  # Add trailing newline
-                
-                # Get base compiler flags
-                base_flags = self.toolchain.cxxflags if test.language == "c++" else self.toolchain.cflags
-                
-                # Run test compilation
-                cmd = compiler + base_flags + flags + ["-c", test_file, "-o", obj_file]                
-                result = subprocess.run(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-                
-                # Update test result
-                test.result = result.returncode == 0
-                test.duration = time.time() - test_start_time
-                
-                # Print status
-                status = "available" if test.result else "not available"
-                print(f"[{i:{counter_width}d}/{len(self.feature_tests)}]  {test.variable:<{varname_width}} ... {status} ({test.duration:.1f}s)")
-                                
-            except Exception as e:
-                print(f"[{i:{counter_width}d}/{len(self.feature_tests)}]  {test.variable:<{varname_width}} ... failed")
-                print(f"Subprocess Error: {e}")
-                test.result = False
-                test.duration = time.time() - test_start_time
-                n_failed += 1
+
+        # Probes are hermetic, so results from earlier builds can be reused
+        # as long as the source, flags and compiler binary are unchanged
+        cache_path = os.path.join(os.path.dirname(self.tmp_dir), ".feature_cache.json")
+        try:
+            with open(cache_path, 'r') as f:
+                cache_data = json.load(f)
+        except (OSError, ValueError):
+            cache_data = {}
+        feature_cache = cache_data.get("results", {})
+        # Durations from earlier runs, kept per variable so they survive
+        # flag/compiler changes that invalidate the result keys
+        known_durations = cache_data.get("durations", {})
+
+        # Toolchain lookups are invariant per language; build them once
+        per_language = {
+            "c": (self.toolchain.cc, self.toolchain.cflags),
+            "c++": (self.toolchain.cxx, self.toolchain.cxxflags),
+        }
+
+        all_tests = sorted(self.feature_tests, key=lambda t: t.variable)
+        cache_keys = {id(test): self._feature_cache_key(test, per_language) for test in all_tests}
+        cached_tests = []
+        pending_tests = []
+        for test in all_tests:
+            key = cache_keys[id(test)]
+            if key is not None and key in feature_cache:
+                test.result = feature_cache[key]
+                test.duration = 0.0
+                cached_tests.append(test)
+            else:
+                pending_tests.append(test)
+
+        for i, test in enumerate(cached_tests, 1):
+            status = "available" if test.result else "not available"
+            print(f"[{i:{counter_width}d}/{len(self.feature_tests)}]  {test.variable:<{varname_width}} ... {status} (cached)")
+
+        # Header tests need nothing on the command line, so groups sharing a
+        # language are folded into one preprocessor probe each, and flag
+        # tests compile the same trivial probe so groups fold into one
+        # compile with bisection on failure; everything else (and
+        # fallbacks) compiles individually
+        individual_tests = [t for t in pending_tests
+                            if t.type not in ("header", "compiler_flag")]
+        batched_tests = []
+        for language in ("c", "c++"):
+            group = [t for t in pending_tests if t.type == "header" and t.language == language]
+            if len(group) > 1 and self._run_header_probe_batch(group, test_dir, per_language):
+                batched_tests.extend(group)
+            else:
+                individual_tests.extend(group)
+        for language in ("c", "c++"):
+            group = [t for t in pending_tests
+                     if t.type == "compiler_flag" and t.language == language]
+            if (len(group) > 1 and self.toolchain.compiler_id != "msvc"
+                    and self._run_flag_probe_batch(group, per_language)):
+                batched_tests.extend(group)
+            else:
+                individual_tests.extend(group)
+
+        for i, test in enumerate(batched_tests, len(cached_tests) + 1):
+            status = "available" if test.result else "not available"
+            print(f"[{i:{counter_width}d}/{len(self.feature_tests)}]  {test.variable:<{varname_width}} ... {status} ({test.duration:.1f}s)")
+
+        # Build the compiler command prefixes once rather than per test
+        probe_prefixes = {
+            lang: [*compiler, *base_flags]
+            for lang, (compiler, base_flags) in per_language.items()
+        }
+
+        # Tests probing identical source with identical flags share one
+        # subprocess; the result fans out to every duplicate
+        unique_tests = []
+        duplicate_map: Dict[int, List[FeatureTestTask]] = {}
+        first_by_key: Dict[str, FeatureTestTask] = {}
+        for test in individual_tests:
+            key = cache_keys[id(test)]
+            primary = first_by_key.get(key) if key is not None else None
+            if primary is not None:
+                duplicate_map.setdefault(id(primary), []).append(test)
+            else:
+                if key is not None:
+                    first_by_key[key] = test
+                unique_tests.append(test)
+
+        # Longest-processing-time-first submission: start the expensive
+        # probes early so they don't straggle at the end of the pool
+        unique_tests.sort(
+            key=lambda t: known_durations.get(t.variable, float(len(t.headers or []))),
+            reverse=True)
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            future_to_test = {
+                executor.submit(self._run_feature_test, test, test_dir, probe_prefixes): test
+                for test in unique_tests
+            }
+            errored = set()
+            counter = len(cached_tests) + len(batched_tests) + 1
+            for future in as_completed(future_to_test):
+                test = future_to_test[future]
+                group = [test] + duplicate_map.get(id(test), [])
+                try:
+                    future.result()
+                    for t in group:
+                        t.result = test.result
+                        t.duration = test.duration
+                        status = "available" if t.result else "not available"
+                        print(f"[{counter:{counter_width}d}/{len(self.feature_tests)}]  {t.variable:<{varname_width}} ... {status} ({t.duration:.1f}s)")
+                        counter += 1
+                except Exception as e:
+                    for t in group:
+                        print(f"[{counter:{counter_width}d}/{len(self.feature_tests)}]  {t.variable:<{varname_width}} ... failed")
+                        counter += 1
+                        t.result = False
+                        errored.add(id(t))
+                        n_failed += 1
+                    print(f"Subprocess Error: {e}")
+
+        # Persist fresh results and durations (skipping probes that
+        # errored) atomically
+        cache_dirty = False
+        for test in pending_tests:
+            key = cache_keys[id(test)]
+            if key is None or id(test) in errored or test.result is None:
+                continue
+            if feature_cache.get(key) != test.result:
+                feature_cache[key] = test.result
+                cache_dirty = True
+            if test.duration and known_durations.get(test.variable) != test.duration:
+                known_durations[test.variable] = test.duration
+                cache_dirty = True
+        if cache_dirty:
+            tmp_path = cache_path + ".tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"results": feature_cache, "durations": known_durations}, f)
+            os.replace(tmp_path, cache_path)
 
         if n_failed:
             print(f"\n{n_failed} of {len(self.feature_tests)} feature tests failed")
         else:
             print("\nAll feature tests completed")
-            
+
         total_time = time.time() - start_time
         print(f"Total feature test time: {total_time:.1f}s")
 
@@ -907,13 +1691,97 @@ class Builder:
         """
         # Collect all available target names
         available_targets = {task.target.name for task in self.compile_tasks}
-        
-        # Find all dependencies that don't exist
-        unresolved = set()
-        for task in self.compile_tasks:
-            for dep_name in task.target.dependencies:
-                if dep_name not in available_targets:
-                    unresolved.add(dep_name)
-                    
-        return sorted(list(unresolved))
+
+        # Set difference of all referenced dependencies, done in C
+        all_deps = set().union(*(task.target.dependencies for task in self.compile_tasks)) \
+            if self.compile_tasks else set()
+        return sorted(all_deps - available_targets)
+
+
+def get_all_include_dirs(target: Target, builder: Builder,
+                         include_private: bool = False) -> List[str]:
+    """Collect include directories for a target and its dependency closure.
+
+    The dependency graph is drained with Kahn's algorithm, so each target
+    is visited exactly once even when several dependency chains share an
+    ancestor (diamond graphs). The target's own include directories come
+    first, followed by the public include directories of its dependencies
+    in topological order.
+
+    ${gen} in an include directory expands to the target's generated files
+    directory; relative results are anchored at the target's root.
+
+    Args:
+        target: Target whose include directories are collected
+        builder: Builder holding the registered targets
+        include_private: Also include the target's private include dirs
+
+    Returns:
+        Deduplicated list of expanded include directories
+
+    Notes:
+        Dependency names without a registered target are skipped, matching
+        how _resolve_dependencies treats unresolved dependencies.
+
+        Results are memoized on the builder per (target name,
+        include_private) and invalidated by add_target; the cache only
+        engages for targets actually registered with the builder.
+    """
+    registered = builder._tasks.get(target.name)
+    cache_key = (target.name, include_private) \
+        if registered is not None and registered.target is target else None
+    if cache_key is not None:
+        cached = builder._include_dir_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+    targets = {name: task.target for name, task in builder._tasks.items()}
+    targets[target.name] = target  # The queried instance wins over the registry
+
+    # Restrict the graph to targets reachable from `target`
+    reachable = {target.name}
+    stack = [target]
+    while stack:
+        for dep_name in stack.pop().dependencies:
+            dep = targets.get(dep_name)
+            if dep is not None and dep_name not in reachable:
+                reachable.add(dep_name)
+                stack.append(dep)
+
+    # Kahn's algorithm over the reachable subgraph; indegree counts
+    # incoming "depends on" edges, so the requested target drains first
+    indegree = {name: 0 for name in reachable}
+    for name in reachable:
+        for dep_name in targets[name].dependencies:
+            if dep_name in reachable:
+                indegree[dep_name] += 1
+
+    queue = deque(name for name in reachable if indegree[name] == 0)
+    ordered: Dict[str, None] = {}  # Insertion-ordered set of results
+    while queue:
+        name = queue.popleft()
+        node = targets[name]
+        dirs = list(node.include_dirs)
+        if include_private and name == target.name:
+            dirs += node.private_include_dirs
+        gen_path = f"{builder.gen_dir}{os.sep}{name}"  # name is never absolute
+        for raw in dirs:
+            # Expand segment-wise and rejoin, so an absolute ${gen}
+            # expansion anchors the path just as os.path.join would
+            expanded = os.path.join(
+                *[part.replace("${gen}", gen_path) for part in raw.split("/")])
+            if not os.path.isabs(expanded):
+                expanded = os.path.join(node.root, expanded)
+            ordered.setdefault(expanded, None)
+        for dep_name in node.dependencies:
+            if dep_name in reachable:
+                indegree[dep_name] -= 1
+                if indegree[dep_name] == 0:
+                    queue.append(dep_name)
+
+    result = list(ordered)
+    if cache_key is not None:
+        builder._include_dir_cache[cache_key] = result
+        return list(result)  # Hand out a copy; the cached list stays pristine
+    return result
 
@@ -4,7 +4,15 @@ This module provides functionality similar to CMake's configure_file command,
 processing template files with variable substitutions and conditional defines.
 """
 
-from typing import Union, Dict, Optional, Any
+import re
+from typing import Union, Dict, Optional
+
+# Substitution markers, compiled once: @VAR@ always, ${VAR} unless at_only
+_AT_PATTERN = re.compile(r'@(\w+)@')
+_AT_DOLLAR_PATTERN = re.compile(r'@(\w+)@|\$\{(\w+)\}')
+
+# #cmakedefine / #cmakedefine01 directive with its variable name
+_CMAKEDEFINE_PATTERN = re.compile(r'#cmakedefine(01)?\s+(\w+)')
 
 
 def _format_define_value(value: Union[bool, int, str, None], *, raw: bool = False) -> Optional[str]:
@@ -33,8 +41,9 @@ def _format_define_value(value: Union[bool, int, str, None], *, raw: bool = Fals
         # Empty string should result in no value
         if not value:
             return None
-        # Always quote if contains spaces or special chars
-        needs_quotes = any(c.isspace() or not c.isalnum() for c in value)
+        # Always quote if contains spaces or special chars; any such char
+        # is non-alphanumeric, so one C-level isalnum scan covers both
+        needs_quotes = not value.isalnum()
         return f'"{value}"' if needs_quotes or not raw else value
     raise ValueError(f"Unsupported value type: {type(value)}")
 
@@ -66,8 +75,9 @@ def _process_cmakedefine(line: str, name: str, value: Union[bool, int, str, None
             # Empty string should result in no value
             if not value:
                 return f"#define {name}"
-            # Quote only if contains spaces or special chars
-            needs_quotes = any(c.isspace() or not c.isalnum() for c in value)
+            # Quote only if contains spaces or special chars (see
+            # _format_define_value for the isalnum equivalence)
+            needs_quotes = not value.isalnum()
             formatted = f'"{value}"' if needs_quotes else value
         else:
             formatted = str(_format_define_value(value, raw=False) or "")
@@ -95,45 +105,79 @@ def _substitute_vars(line: str, definitions: Dict[str, Union[bool, int, str, Non
     Returns:
         Line with variables substituted
     """
-    result = line
-    
-    def substitute_pattern(pattern: str, name: str, value: Any, in_string: bool) -> str:
-        """Helper to substitute a single pattern.
-        
-        Args:
-            pattern: String containing the pattern
-            name: Pattern to replace (e.g. @VAR@ or ${VAR})
-            value: Value to substitute
-            in_string: Whether we're substituting inside an existing string
-        """
+    # Most template lines contain no marker at all; skip them without
+    # entering the regex machinery
+    if "@" not in line and (at_only or "${" not in line):
+        return line
+
+    pattern = _AT_PATTERN if at_only else _AT_DOLLAR_PATTERN
+    strip_trailing = False
+
+    def substitute_match(match: "re.Match") -> str:
+        """Render the replacement for one @VAR@ or ${VAR} occurrence."""
+        nonlocal strip_trailing
+        at_name = match.group(1)
+        # @VAR@ substitutions are typically not inside strings;
+        # ${VAR} substitutions are typically inside strings
+        in_string = at_name is None
+        name = at_name if not in_string else match.group(2)
+        value = definitions.get(name)
+        if value is None:
+            return match.group(0)
         # Empty string should result in empty substitution
         if isinstance(value, str) and not value:
-            # Replace the pattern and trim any trailing whitespace
-            replaced = pattern.replace(name, "")
-            return replaced.rstrip() if not in_string else replaced
+            # Trim trailing whitespace from the finished line
+            if not in_string:
+                strip_trailing = True
+            return ""
         # Use raw values when substituting inside strings
         formatted = _format_define_value(value, raw=in_string)
-        if formatted is not None:
-            if in_string and isinstance(value, str) and formatted.startswith('"'):
-                # Remove quotes when interpolating into a string
-                formatted = formatted[1:-1]
-            return pattern.replace(name, formatted)
-        return pattern
-    
-    # Always process @VAR@ syntax
-    for name, value in definitions.items():
-        if value is not None:
-            # @VAR@ substitutions are typically not inside strings
-            result = substitute_pattern(result, f"@{name}@", value, False)
-    
-    # Process ${VAR} syntax unless at_only is True
-    if not at_only:
-        for name, value in definitions.items():
-            if value is not None:
-                # ${VAR} substitutions are typically inside strings
-                result = substitute_pattern(result, f"${{{name}}}", value, True)
-    
-    return result
+        if formatted is None:
+            return match.group(0)
+        if in_string and isinstance(value, str) and formatted.startswith('"'):
+            # Remove quotes when interpolating into a string
+            formatted = formatted[1:-1]
+        return formatted
+
+    result = pattern.sub(substitute_match, line)
+    return result.rstrip() if strip_trailing else result
+
+
+def cmake_configure_stream(
+    input_stream,
+    output_stream,
+    definitions: Dict[str, Union[bool, int, str, None]],
+    *,
+    at_only: bool = False
+) -> None:
+    """Process a template between already-open text streams.
+
+    Accepts any readable/writable text objects (files, io.StringIO), so
+    callers with in-memory templates can skip the filesystem entirely.
+    See cmake_configure_file for the directive semantics.
+
+    Args:
+        input_stream: Readable text stream with the template
+        output_stream: Writable text stream for the processed result
+        definitions: Dictionary mapping names to their values
+        at_only: If True, only process @VAR@ syntax
+    """
+    processed_lines = []
+    for line in input_stream.read().splitlines():
+        stripped = line.strip()
+        directive = _CMAKEDEFINE_PATTERN.match(stripped)
+        if directive:
+            name = directive.group(2)
+            processed = _process_cmakedefine(
+                stripped, name, definitions.get(name), directive.group(1) == "01")
+        else:
+            processed = _substitute_vars(line, definitions, at_only)
+
+        processed_lines.append(processed)
+
+    # Single write; any newline translation belongs to the stream
+    if processed_lines:
+        output_stream.write("\n".join(processed_lines) + "\n")
 
 
 def cmake_configure_file(
@@ -170,26 +214,8 @@ def cmake_configure_file(
         "LF": "\n",
         "CRLF": "\r\n"
     }[newline]
-    
-    with open(template_path, 'r', encoding=encoding, newline='') as f:
-        lines = f.readlines()
-    
-    processed_lines = []
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith("#cmakedefine01 "):
-            name = stripped.split(None, 1)[1].split(None, 1)[0]
-            value = definitions.get(name)
-            processed = _process_cmakedefine(stripped, name, value, True)
-        elif stripped.startswith("#cmakedefine "):
-            name = stripped.split(None, 1)[1].split(None, 1)[0]
-            value = definitions.get(name)
-            processed = _process_cmakedefine(stripped, name, value, False)
-        else:
-            processed = _substitute_vars(line.rstrip('\r\n'), definitions, at_only)
-        
-        processed_lines.append(processed)
-    
-    with open(output_path, 'w', encoding=encoding, newline=newline_chars) as f:
-        for line in processed_lines:
-            print(line, file=f) 
\ No newline at end of file
+
+    # The output file's newline translation applies to the joined "\n"s
+    with open(template_path, 'r', encoding=encoding, newline='') as f_in, \
+         open(output_path, 'w', encoding=encoding, newline=newline_chars) as f_out:
+        cmake_configure_stream(f_in, f_out, definitions, at_only=at_only)
\ No newline at end of file
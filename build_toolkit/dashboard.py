@@ -1,8 +1,13 @@
 """Dashboard generation module for build results visualization."""
 
+import hashlib
+import io
 import os
 import shlex
-from typing import List, Optional, Sequence
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import List, NamedTuple, Optional, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from string import Template
@@ -12,7 +17,206 @@ from build_toolkit.builder import Builder, CompileTask
 TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "templates", "dashboard.html")
 
 with open(TEMPLATE_PATH, "r", encoding="utf-8") as f:
-    HTML_TEMPLATE = Template(f.read())
+    _raw_template = f.read()
+
+# The outer page has exactly two insertion points; split it once at import
+# so make_dashboard can stream the literal chunks around the generated
+# sections instead of substituting into one output-sized string.
+# "$$" is Template's escape for a literal dollar; apply it here since the
+# chunks are written verbatim.
+_head, _rest = _raw_template.split("${tree_content}", 1)
+_mid, _tail = _rest.split("${content}", 1)
+_TPL_HEAD, _TPL_MID, _TPL_TAIL = (
+    part.replace("$$", "$") for part in (_head, _mid, _tail))
+del _raw_template, _head, _rest, _mid, _tail
+
+# Per-item HTML skeletons, compiled once at import. Template.substitute
+# reuses the interned skeleton bytes instead of rebuilding the literal
+# for every command/library/tree node.
+_GEN_STEP_TPL = Template('''
+            <div class="compilation-header">
+                <h2>Generate $output_name</h2>
+                <div class="status-indicator">
+                    <span class="duration-pill">${duration}s</span>
+                    <span class="status-pill $status_class">$status_text</span>
+                </div>
+            </div>
+            <div class="code-block">
+                <div class="code-caption">
+                    <span>Template File</span>
+                </div>
+                <pre>$template</pre>
+                <div class="code-caption">
+                    <span>Output File</span>
+                </div>
+                <pre>$output</pre>
+                <div class="code-caption">
+                    <span>Type</span>
+                </div>
+                <pre>$type</pre>
+            </div>''')
+
+_COMPILE_BLOCK_TPL = Template('''
+            <div id="$result_id">
+                <div class="compilation-header">
+                    <h2>Compile $source_name</h2>
+                    <div class="status-indicator">
+                        <span class="duration-pill">${duration}s</span>
+                        <span class="status-pill $status_class">$status_text</span>
+                    </div>
+                </div>
+
+                <div class="code-block">
+                    <div class="code-caption">
+                        <span>Input File</span>
+                    </div>
+                    <pre>$source_file</pre>
+                    <div class="code-caption">
+                        <span>Output File</span>
+                    </div>
+                    <pre>$output_file</pre>
+                </div>
+
+                <div class="code-block command-block">
+                    <div class="code-caption">
+                        <span>Compilation Command</span>
+                    </div>
+                    <pre>$command</pre>
+                </div>
+        ''')
+
+# Command output is written around these fixed halves so large compiler
+# logs go straight to the buffer without an intermediate joined copy.
+# The tail also closes the enclosing command/library block.
+_OUTPUT_BLOCK_PRE = '''
+                <div class="code-block output-block">
+                    <div class="code-caption">
+                        <span>Command Output</span>
+                    </div>
+                    <div class="collapsible-content">
+                        <pre>'''
+
+_OUTPUT_BLOCK_POST = '''</pre>
+                        <button class="show-more" onclick="toggleOutput(this)">More</button>
+                    </div>
+                </div>
+            </div>'''
+
+_LIB_BLOCK_TPL = Template('''
+            <div id="$lib_id">
+                <div class="compilation-header">
+                    <h2>Library: $lib_name</h2>
+                    <div class="status-indicator">
+                        <span class="duration-pill">${duration}s</span>
+                        <span class="status-pill $status_class">$status_text</span>
+                    </div>
+                </div>
+                $size_html
+
+                <div class="code-block">
+                    <div class="code-caption">
+                        <span>Object Files</span>
+                    </div>
+                    <pre>''')
+
+_LIB_BLOCK_TAIL_TPL = Template('''</pre>
+                    <div class="code-caption">
+                        <span>Output File</span>
+                    </div>
+                    <pre>$output_file</pre>
+                </div>
+
+                <div class="code-block command-block">
+                    <div class="code-caption">
+                        <span>Archive Command</span>
+                    </div>
+                    <pre>$command</pre>
+                </div>''')
+
+_TREE_TARGET_TPL = Template('''
+            <div class="tree-node">
+                <div class="tree-item" data-target="$target_id">
+                    <div class="tree-item-content">
+                        <span class="arrow">▶</span>
+                        <span onclick="scrollToSection('$target_id')">Target $name</span>
+                    </div>
+                    <div class="tree-item-indicators">
+                        <span class="status-dot $status_class"></span>
+                    </div>
+                </div>
+                <div class="tree-children">
+        ''')
+
+_TREE_CHILD_TPL = Template('''
+                    <div class="tree-item child" data-target="$result_id">
+                        <div class="tree-item-content">
+                            <span class="file-icon">\U0001f4c4</span>
+                            <span onclick="scrollToSection('$result_id')" title="$source_file">$source_name</span>
+                        </div>
+                        <div class="tree-item-indicators">
+                            <span class="duration-pill">${duration}s</span>
+                            <span class="status-dot $status_class"></span>
+                        </div>
+                    </div>
+            ''')
+
+_TREE_LIB_CHILD_TPL = Template('''
+                    <div class="tree-item child" data-target="$lib_id">
+                        <div class="tree-item-content">
+                            <span class="file-icon">\U0001f4c4</span>
+                            <span onclick="scrollToSection('$lib_id')">$lib_name</span>
+                        </div>
+                        <div class="tree-item-indicators">
+                            <span class="duration-pill">${duration}s</span>
+                            <span class="status-dot $status_class"></span>
+                        </div>
+                    </div>
+            ''')
+
+_FEATURE_ROW_TPL = Template('''
+                <tr>
+                    <td style="padding: 0.25em 1em;">$variable</td>
+                    <td style="padding: 0.25em 1em;">$details</td>
+                    <td style="text-align: center; padding: 0.25em 1em;">$result</td>
+                    <td style="padding: 0.25em 1em;">$targets</td>
+                </tr>
+            ''')
+
+# Status tokens recur for every task, command and library block;
+# interning keeps one shared object per token instead of a fresh
+# reference being threaded through each substitution
+_SUCCESS = sys.intern('success')
+_FAILURE = sys.intern('failure')
+_SUCCESS_TEXT = sys.intern('Success')
+_FAILURE_TEXT = sys.intern('Failed')
+
+# HTML escaping in one C-level pass; a translate table beats four
+# sequential str.replace scans
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+def _e(value) -> str:
+    """Escape a value for interpolation into dashboard HTML."""
+    return str(value).translate(_HTML_ESCAPE)
+
+# Basenames recur constantly (content pass, tree pass, result IDs);
+# memoize per unique path. Cleared at the start of make_dashboard.
+_basename_cache: dict = {}
+
+def _bn(path: str) -> str:
+    """os.path.basename memoized per path."""
+    name = _basename_cache.get(path)
+    if name is None:
+        name = _basename_cache.setdefault(path, os.path.basename(path))
+    return name
+
+class CommandSummary(NamedTuple):
+    """Flat per-command record; tuple fields are cheaper to store and
+    read than the per-command dicts they replace."""
+    command: object
+    success: bool
+    duration: float
+    stdout: str
+    stderr: str
 
 @dataclass
 class TaskSummary:
@@ -20,7 +224,55 @@ class TaskSummary:
     name: str
     task: 'CompileTask'  # Reference to the original task
     succeeded: bool
-    compile_results: list
+    compile_results: List[CommandSummary]
+
+@dataclass
+class _BuildStats:
+    """Per-phase status and totals, computed in one traversal."""
+    all_succeeded: bool = True
+    compile_success: bool = True
+    archive_success: bool = True
+    gen_success: bool = True
+    feature_time: float = 0.0
+    generation_time: float = 0.0
+    compilation_time: float = 0.0
+    archive_time: float = 0.0
+    total_features: int = 0
+    total_generated: int = 0
+    total_compiled: int = 0
+    total_archived: int = 0
+
+def _collect_build_stats(builder: Builder) -> _BuildStats:
+    """Walk the builder's tasks once and gather everything the tree view
+    and the overview section need, instead of each re-traversing."""
+    stats = _BuildStats()
+    stats.total_features = len(builder.feature_tests)
+    stats.feature_time = sum(test.duration for test in builder.feature_tests if hasattr(test, 'duration'))
+    stats.compilation_time = builder.total_compile_time
+    stats.total_archived = len(builder.archive_tasks)
+
+    for task in builder.compile_tasks:
+        for step in task.generated_steps:
+            stats.total_generated += 1
+            if step.succeeded:
+                stats.generation_time += step.duration
+            else:
+                stats.gen_success = False
+        for command in task.commands:
+            stats.total_compiled += 1
+            result = command.result
+            if not result or not result.succeeded:
+                stats.compile_success = False
+
+    for archive in builder.archive_tasks:
+        result = archive.result
+        if result and result.succeeded:
+            stats.archive_time += result.duration
+        else:
+            stats.archive_success = False
+
+    stats.all_succeeded = stats.compile_success and stats.archive_success
+    return stats
 
 def _summarize_task(task):
     """Create a summary of a compile task."""
@@ -32,20 +284,21 @@ def _summarize_task(task):
         if result is None or not result.succeeded:
             succeeded = False
             
-        compile_results.append({
-            'command': command,
-            'success': result.succeeded if result else False,
-            'duration': result.duration if result else 0.0,
-            'stdout': result.stdout if result else '',
-            'stderr': result.stderr if result else ''
-        })
+        compile_results.append(CommandSummary(
+            command=command,
+            success=result.succeeded if result else False,
+            duration=result.duration if result else 0.0,
+            stdout=result.stdout if result else '',
+            stderr=result.stderr if result else ''
+        ))
         
-    return TaskSummary(
+    summary = TaskSummary(
         name=task.target.name,
         task=task,
         succeeded=succeeded,
         compile_results=compile_results
     )
+    return summary
 
 def _generate_result_id(command_result, task_name: str) -> str:
     """Generate a consistent ID for a compilation result.
@@ -57,25 +310,76 @@ def _generate_result_id(command_result, task_name: str) -> str:
     Returns:
         A stable ID string based on the task name and source file
     """
-    command = command_result['command']
+    command = command_result.command
     # Use task name and source file for a stable ID
-    safe_path = os.path.basename(command.source_file).replace('.', '_')
+    safe_path = _bn(command.source_file).replace('.', '_')
     return f"compile-{task_name}-{safe_path}"
 
+def _task_section_cache_key(task_summary: TaskSummary) -> str:
+    """Content hash over everything a task section renders from."""
+    task = task_summary.task
+    target = task.target
+    h = hashlib.blake2b(digest_size=16)
+    u = h.update
+    def feed(*parts):
+        for part in parts:
+            u(str(part).encode('utf-8', 'surrogateescape'))
+            u(b'\0')
+    feed(task_summary.name, *target.dependencies, *target.system_dependencies,
+         *task.public_include_dirs, *task.private_include_dirs,
+         *task.public_definitions, *task.private_definitions)
+    for step in task.generated_steps:
+        feed(step.template, step.output, step.type, step.succeeded,
+             f"{step.duration:.1f}", step.error or '')
+        for key, value in step.definitions.items():
+            feed(key, value)
+    for cr in task_summary.compile_results:
+        feed(cr.command.command, cr.command.source_file,
+             cr.command.output_file, cr.success, f"{cr.duration:.1f}",
+             cr.stdout, cr.stderr)
+    return h.hexdigest()
+
+def _cached_task_section(task_summary: TaskSummary,
+                         cache_dir: Optional[str]) -> str:
+    """Fetch a task section from the on-disk cache or generate it.
+
+    Incremental rebuilds leave most sections byte-identical; a cache hit
+    skips all of the section's string formatting. Cache problems fall
+    back to plain generation.
+    """
+    if cache_dir is None:
+        return _generate_task_section(task_summary)
+    path = os.path.join(cache_dir, _task_section_cache_key(task_summary) + ".html")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        pass
+    section = _generate_task_section(task_summary)
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(section)
+    except OSError:
+        pass
+    return section
+
 def _generate_task_section(task_summary: TaskSummary) -> str:
     """Generate HTML for a compilation task section."""
-    content = []
+    # Write fragments straight into a string buffer; appending to a list
+    # and joining would copy every fragment a second time
+    buf = io.StringIO()
+    w = buf.write
     target_id = f"target-{task_summary.name}"
-    
-    content.append(f'''
+
+    w(f'''
         <div id="{target_id}">
             <h1>Target: {task_summary.name}</h1>
     ''')
 
     # Dependencies section
     if task_summary.task.target.dependencies:
-        deps_str = "\n".join(task_summary.task.target.dependencies)
-        content.append(f'''
+        deps_str = _e("\n".join(task_summary.task.target.dependencies))
+        w(f'''
             <h2>Dependencies</h2>
             <div class="code-block">
                 <pre class="dependencies">{deps_str}</pre>
@@ -84,300 +388,246 @@ def _generate_task_section(task_summary: TaskSummary) -> str:
 
     # Include directories section
     if task_summary.task.public_include_dirs or task_summary.task.private_include_dirs:
-        content.append('''
+        w('''
             <h2>Include Directories</h2>
             <div class="code-block">
         ''')
         
         # Show public includes if any
         if task_summary.task.public_include_dirs:
-            paths = "\n".join(task_summary.task.public_include_dirs)
-            content.append(f'''
+            paths = _e("\n".join(task_summary.task.public_include_dirs))
+            w(f'''
                 <div class="section-header">Public</div>
                 <pre class="include-paths">{paths}</pre>
             ''')
         
         # Show private includes if any
         if task_summary.task.private_include_dirs:
-            paths = "\n".join(task_summary.task.private_include_dirs)
-            content.append(f'''
+            paths = _e("\n".join(task_summary.task.private_include_dirs))
+            w(f'''
                 <div class="section-header">Private</div>
                 <pre class="include-paths">{paths}</pre>
             ''')
         
-        content.append('''
+        w('''
             </div>
         ''')
 
-    # System Dependencies section
+    # System Dependencies section; one write covers header, body and
+    # closing tags since nothing in between is conditional
     if task_summary.task.target.system_dependencies:
-        content.append('''
+        sys_deps_str = _e("\n".join(task_summary.task.target.system_dependencies))
+        w(f'''
             <h2>System Dependencies</h2>
             <div class="code-block">
-        ''')
-        sys_deps_str = "\n".join(task_summary.task.target.system_dependencies)
-        content.append(f'''
+
             <pre class="system-dependencies">{sys_deps_str}</pre>
-        ''')
-        content.append('''
+
             </div>
         ''')
 
     # Definitions section
     if task_summary.task.public_definitions or task_summary.task.private_definitions:
-        content.append('''
+        w('''
             <h2>Definitions</h2>
             <div class="code-block">
         ''')
         
         # Show public definitions if any
         if task_summary.task.public_definitions:
-            definitions_str = "\n".join(task_summary.task.public_definitions)
-            content.append(f'''
+            definitions_str = _e("\n".join(task_summary.task.public_definitions))
+            w(f'''
                 <div class="section-header">Public</div>
                 <pre>{definitions_str}</pre>
             ''')
         
         # Show private definitions if any
         if task_summary.task.private_definitions:
-            private_defs = "\n".join(task_summary.task.private_definitions)
-            content.append(f'''
+            private_defs = _e("\n".join(task_summary.task.private_definitions))
+            w(f'''
                 <div class="section-header">Private</div>
                 <pre>{private_defs}</pre>
             ''')
         
-        content.append('''
+        w('''
             </div>
         ''')
 
     # Add file generation section if present
     if task_summary.task.generated_steps:
         for step in task_summary.task.generated_steps:
-            status_class = 'success' if step.succeeded else 'failure'
-            status_text = 'Success' if step.succeeded else 'Failed'
-            content.append(f'''
-            <div class="compilation-header">
-                <h2>Generate {os.path.basename(step.output)}</h2>
-                <div class="status-indicator">
-                    <span class="duration-pill">{step.duration:.1f}s</span>
-                    <span class="status-pill {status_class}">{status_text}</span>
-                </div>
-            </div>
-            <div class="code-block">
-                <div class="code-caption">
-                    <span>Template File</span>
-                </div>
-                <pre>{step.template}</pre>
-                <div class="code-caption">
-                    <span>Output File</span>
-                </div>
-                <pre>{step.output}</pre>
-                <div class="code-caption">
-                    <span>Type</span>
-                </div>
-                <pre>{step.type}</pre>
-            </div>''')
+            status_class = _SUCCESS if step.succeeded else _FAILURE
+            status_text = _SUCCESS_TEXT if step.succeeded else _FAILURE_TEXT
+            w(_GEN_STEP_TPL.substitute(
+                output_name=_bn(step.output),
+                duration=f"{step.duration:.1f}",
+                status_class=status_class,
+                status_text=status_text,
+                template=_e(step.template),
+                output=_e(step.output),
+                type=_e(step.type)))
             if step.definitions:
-                content.append('''
+                w('''
                 <div class="code-block">
                     <div class="code-caption">
                         <span>Definitions</span>
                     </div>
                     <pre>''')
                 for key, value in step.definitions.items():
-                    content.append(f"{key} = {value}")
-                content.append('''</pre>
+                    w(_e(f"{key} = {value}") + "\n")
+                w('''</pre>
                 </div>''')
             if not step.succeeded and step.error:
-                content.append(f'''
+                w(f'''
                 <div class="code-block error">
                     <div class="code-caption">
                         <span>Error</span>
                     </div>
-                    <pre>{step.error}</pre>
+                    <pre>{_e(step.error)}</pre>
                 </div>''')
-            content.append('')
 
-    # Use compile results in their original order
-    for i, command_result in enumerate(task_summary.compile_results):
-        result_id = _generate_result_id(command_result, task_summary.name)
-        status_class = 'success' if command_result['success'] else 'failure'
-        status_text = 'Success' if command_result['success'] else 'Failed'
-        command = command_result['command']
-
-        content.append(rf'''
-            <div id="{result_id}">
-                <div class="compilation-header">
-                    <h2>Compile {os.path.basename(command.source_file)}</h2>
-                    <div class="status-indicator">
-                        <span class="duration-pill">{command_result['duration']:.1f}s</span>
-                        <span class="status-pill {status_class}">{status_text}</span>
-                    </div>
-                </div>
-
-                <div class="code-block">
-                    <div class="code-caption">
-                        <span>Input File</span>
-                    </div>
-                    <pre>{command.source_file}</pre>
-                    <div class="code-caption">
-                        <span>Output File</span>
-                    </div>
-                    <pre>{command.output_file}</pre>
-                </div>
-
-                <div class="code-block command-block">
-                    <div class="code-caption">
-                        <span>Compilation Command</span>
-                    </div>
-                    <pre>{command.command}</pre>
-                </div>
-        ''')
-
-        # Show command output if any
-        if command_result['stdout'] or command_result['stderr']:
-            output = []
-            if command_result['stdout']:
-                output.append(command_result['stdout'])
-            if command_result['stderr']:
-                if output:  # If we already have stdout
-                    output.append("\n--- stderr ---\n")
-                output.append(command_result['stderr'])
-                
-            content.append(rf'''
-                <div class="code-block output-block">
-                    <div class="code-caption">
-                        <span>Command Output</span>
-                    </div>
-                    <div class="collapsible-content">
-                        <pre>{"".join(output)}</pre>
-                        <button class="show-more" onclick="toggleOutput(this)">More</button>
-                    </div>
-                </div>
-            ''')
-
-        content.append('</div>')
-
-    content.append('</div>')
-    return "\n".join(content)
+    # Use compile results in their original order; subscripts and
+    # attributes are hoisted to locals once per command
+    task_name = task_summary.name
+    for command_result in task_summary.compile_results:
+        command = command_result.command
+        succeeded = command_result.success
+        stdout = command_result.stdout
+        stderr = command_result.stderr
+        source_file = command.source_file
+        result_id = _generate_result_id(command_result, task_name)
+        status_class = _SUCCESS if succeeded else _FAILURE
+        status_text = _SUCCESS_TEXT if succeeded else _FAILURE_TEXT
+
+        w(_COMPILE_BLOCK_TPL.substitute(
+            result_id=result_id,
+            source_name=_bn(source_file),
+            duration=f"{command_result.duration:.1f}",
+            status_class=status_class,
+            status_text=status_text,
+            source_file=_e(source_file),
+            output_file=_e(command.output_file),
+            command=_e(command.command)))
+
+        # Show command output if any; streams are escaped and written
+        # piecewise, never joined into a temporary
+        if stdout or stderr:
+            w(_OUTPUT_BLOCK_PRE)
+            if stdout:
+                w(_e(stdout))
+            if stderr:
+                if stdout:
+                    w("\n--- stderr ---\n")
+                w(_e(stderr))
+            w(_OUTPUT_BLOCK_POST)
+        else:
+            w('</div>')
+
+    w('</div>')
+    return buf.getvalue()
+
+def _safe_getsize(path: str) -> int:
+    """os.path.getsize that reports failure as -1 instead of raising."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return -1
 
 def _generate_libraries_section(archive_tasks) -> str:
     """Generate HTML content for the libraries section."""
-    content = []
-    
+    buf = io.StringIO()
+    w = buf.write
+
+    # Stat every archive output up front; a small thread pool overlaps
+    # the per-file stat latency instead of paying it serially in the loop
+    sized = [a.output_file for a in archive_tasks
+             if a.result and a.result.succeeded]
+    if len(sized) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(sized), os.cpu_count() or 1)) as ex:
+            sizes = dict(zip(sized, ex.map(_safe_getsize, sized)))
+    else:
+        sizes = {path: _safe_getsize(path) for path in sized}
+
     # Add section header with ID
-    content.append('''
+    w('''
         <div id="libraries">
             <h1>Output Libraries</h1>
     ''')
     
     for archive in archive_tasks:
-        lib_id = f"lib-{os.path.basename(archive.output_file)}"
-        status_class = "success" if archive.result and archive.result.succeeded else "failure"
-        status_text = "Success" if archive.result and archive.result.succeeded else "Failed"
+        lib_id = f"lib-{_bn(archive.output_file)}"
+        status_class = _SUCCESS if archive.result and archive.result.succeeded else _FAILURE
+        status_text = _SUCCESS_TEXT if archive.result and archive.result.succeeded else _FAILURE_TEXT
         
-        try:
-            size = os.path.getsize(archive.output_file) if archive.result and archive.result.succeeded else 0
-            size_str = f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} bytes"
-        except OSError:
+        size = sizes.get(archive.output_file, 0)
+        if size < 0:
             size_str = "Unknown"
+        else:
+            size_str = f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} bytes"
         
-        content.append(rf'''
-            <div id="{lib_id}">
-                <div class="compilation-header">
-                    <h2>Library: {os.path.basename(archive.output_file)}</h2>
-                    <div class="status-indicator">
-                        <span class="duration-pill">{archive.result.duration:.1f}s</span>
-                        <span class="status-pill {status_class}">{status_text}</span>
-                    </div>
-                </div>
-                {f'<p>Size: {size_str}</p>' if archive.result and archive.result.succeeded else ''}
-                
-                <div class="code-block">
-                    <div class="code-caption">
-                        <span>Object Files</span>
-                    </div>
-                    <pre>''')
+        w(_LIB_BLOCK_TPL.substitute(
+            lib_id=lib_id,
+            lib_name=_bn(archive.output_file),
+            duration=f"{archive.result.duration:.1f}",
+            status_class=status_class,
+            status_text=status_text,
+            size_html=f'<p>Size: {size_str}</p>' if archive.result and archive.result.succeeded else ''))
         
-        # Collect all object files
-        object_files = []
+        # Write object-file paths straight to the buffer; no intermediate
+        # list or joined copy for archives with many objects
+        first = True
         for task in archive.compile_tasks:
             for command in task.commands:
-                object_files.append(command.output_file)
-        
-        # Join with explicit line breaks and append to content
-        content.append('\n'.join(object_files))
-        
-        content.append(f'''</pre>
-                    <div class="code-caption">
-                        <span>Output File</span>
-                    </div>
-                    <pre>{archive.output_file}</pre>
-                </div>
-                
-                <div class="code-block command-block">
-                    <div class="code-caption">
-                        <span>Archive Command</span>
-                    </div>
-                    <pre>{archive.command}</pre>
-                </div>''')
+                if not first:
+                    w('\n')
+                w(_e(command.output_file))
+                first = False
+
+        w(_LIB_BLOCK_TAIL_TPL.substitute(
+            output_file=_e(archive.output_file),
+            command=_e(archive.command)))
         
         if archive.result:
             # Show error message if failed
             if not archive.result.succeeded and archive.result.error:
-                content.append(rf'''
+                w(f'''
                     <div class="code-block error">
                         <div class="code-caption">
                             <span>Error</span>
                         </div>
-                        <pre>{archive.result.error}</pre>
+                        <pre>{_e(archive.result.error)}</pre>
                     </div>
                 ''')
 
-            # Show command output if any
-            if archive.result.stdout or archive.result.stderr:
-                output = []
-                if archive.result.stdout:
-                    output.append(archive.result.stdout)
-                if archive.result.stderr:
-                    if output:  # If we already have stdout
-                        output.append("\n--- stderr ---\n")
-                    output.append(archive.result.stderr)
-                    
-                content.append(rf'''
-                    <div class="code-block output-block">
-                        <div class="code-caption">
-                            <span>Command Output</span>
-                        </div>
-                        <div class="collapsible-content">
-                            <pre>{"".join(output)}</pre>
-                            <button class="show-more" onclick="toggleOutput(this)">More</button>
-                        </div>
-                    </div>
-                ''')
-        
-        content.append('</div>')
-    
-    return "\n".join(content)
+            # Show command output if any; written piecewise like the
+            # compile blocks, with the tail closing the library block
+            ar_stdout = archive.result.stdout
+            ar_stderr = archive.result.stderr
+            if ar_stdout or ar_stderr:
+                w(_OUTPUT_BLOCK_PRE)
+                if ar_stdout:
+                    w(_e(ar_stdout))
+                if ar_stderr:
+                    if ar_stdout:
+                        w("\n--- stderr ---\n")
+                    w(_e(ar_stderr))
+                w(_OUTPUT_BLOCK_POST)
+            else:
+                w('</div>')
+        else:
+            w('</div>')
+
+    return buf.getvalue()
+
+def _generate_tree_view(builder: Builder, stats: _BuildStats, out,
+                        summaries: Sequence[TaskSummary]) -> None:
+    """Write the tree view HTML content to `out`."""
+    w = out.write
+
+    all_succeeded = stats.all_succeeded
 
-def _generate_tree_view(builder: Builder) -> list[str]:
-    """Generate the tree view HTML content."""
-    tree_content = []
-    
-    # Calculate overall build status
-    all_succeeded = True
-    for task in builder.compile_tasks:
-        for command in task.commands:
-            if not command.result or not command.result.succeeded:
-                all_succeeded = False
-                break
-    for archive in builder.archive_tasks:
-        if not archive.result or not archive.result.succeeded:
-            all_succeeded = False
-            break
-    
     # Add build overview
-    tree_content.append(f'''
+    w(f'''
         <div class="tree-node">
             <div class="tree-item" data-target="overview">
                 <div class="tree-item-content">
@@ -385,7 +635,7 @@ def _generate_tree_view(builder: Builder) -> list[str]:
                     <span onclick="scrollToSection('overview')">Build Overview</span>
                 </div>
                 <div class="tree-item-indicators">
-                    <span class="status-dot {'success' if all_succeeded else 'failure'}"></span>
+                    <span class="status-dot {_SUCCESS if all_succeeded else _FAILURE}"></span>
                 </div>
             </div>
         </div>
@@ -393,7 +643,7 @@ def _generate_tree_view(builder: Builder) -> list[str]:
     
     # Add feature tests section if there are any
     if builder.feature_tests:
-        tree_content.append(f'''
+        w(f'''
             <div class="tree-node">
                 <div class="tree-item" data-target="feature-tests">
                     <div class="tree-item-content">
@@ -405,53 +655,36 @@ def _generate_tree_view(builder: Builder) -> list[str]:
         ''')
     
     # Add targets
-    task_summaries = [_summarize_task(task) for task in builder.compile_tasks]
-    for task_summary in task_summaries:
+    for task_summary in summaries:
         target_id = f"target-{task_summary.name}"
-        status_class = "success" if task_summary.succeeded else "failure"
-        
-        tree_content.append(rf'''
-            <div class="tree-node">
-                <div class="tree-item" data-target="{target_id}">
-                    <div class="tree-item-content">
-                        <span class="arrow">▶</span>
-                        <span onclick="scrollToSection('{target_id}')">Target {task_summary.name}</span>
-                    </div>
-                    <div class="tree-item-indicators">
-                        <span class="status-dot {status_class}"></span>
-                    </div>
-                </div>
-                <div class="tree-children">
-        ''')
+        status_class = _SUCCESS if task_summary.succeeded else _FAILURE
         
+        w(_TREE_TARGET_TPL.substitute(
+            target_id=target_id,
+            name=task_summary.name,
+            status_class=status_class))
+
         # Use compile results in their original order
         for i, command_result in enumerate(task_summary.compile_results):
             result_id = _generate_result_id(command_result, task_summary.name)
-            status_class = 'success' if command_result['success'] else 'failure'
-            tree_content.append(rf'''
-                    <div class="tree-item child" data-target="{result_id}">
-                        <div class="tree-item-content">
-                            <span class="file-icon">📄</span>
-                            <span onclick="scrollToSection('{result_id}')" title="{command_result['command'].source_file}">{os.path.basename(command_result['command'].source_file)}</span>
-                        </div>
-                        <div class="tree-item-indicators">
-                            <span class="duration-pill">{command_result['duration']:.1f}s</span>
-                            <span class="status-dot {status_class}"></span>
-                        </div>
-                    </div>
-            ''')
+            status_class = _SUCCESS if command_result.success else _FAILURE
+            w(_TREE_CHILD_TPL.substitute(
+                result_id=result_id,
+                source_file=_e(command_result.command.source_file),
+                source_name=_bn(command_result.command.source_file),
+                duration=f"{command_result.duration:.1f}",
+                status_class=status_class))
         
-        tree_content.append('''
+        w('''
                 </div>
             </div>
         ''')
 
     # Add libraries section
     if builder.archive_tasks:
-        # Calculate overall library status
-        libs_succeeded = all(archive.result and archive.result.succeeded for archive in builder.archive_tasks)
-        
-        tree_content.append(rf'''
+        libs_succeeded = stats.archive_success
+
+        w(f'''
             <div class="tree-node">
                 <div class="tree-item" data-target="libraries">
                     <div class="tree-item-content">
@@ -459,7 +692,7 @@ def _generate_tree_view(builder: Builder) -> list[str]:
                         <span onclick="scrollToSection('libraries')">Output Libraries</span>
                     </div>
                     <div class="tree-item-indicators">
-                        <span class="status-dot {'success' if libs_succeeded else 'failure'}"></span>
+                        <span class="status-dot {_SUCCESS if libs_succeeded else _FAILURE}"></span>
                     </div>
                 </div>
                 <div class="tree-children">
@@ -467,38 +700,30 @@ def _generate_tree_view(builder: Builder) -> list[str]:
         
         # Add archive tasks as children
         for archive in builder.archive_tasks:
-            lib_id = f"lib-{os.path.basename(archive.output_file)}"
-            status_class = "success" if archive.result and archive.result.succeeded else "failure"
+            lib_id = f"lib-{_bn(archive.output_file)}"
+            status_class = _SUCCESS if archive.result and archive.result.succeeded else _FAILURE
             duration = archive.result.duration if archive.result else 0.0
             
-            tree_content.append(rf'''
-                    <div class="tree-item child" data-target="{lib_id}">
-                        <div class="tree-item-content">
-                            <span class="file-icon">📄</span>
-                            <span onclick="scrollToSection('{lib_id}')">{os.path.basename(archive.output_file)}</span>
-                        </div>
-                        <div class="tree-item-indicators">
-                            <span class="duration-pill">{duration:.1f}s</span>
-                            <span class="status-dot {status_class}"></span>
-                        </div>
-                    </div>
-            ''')
+            w(_TREE_LIB_CHILD_TPL.substitute(
+                lib_id=lib_id,
+                lib_name=_bn(archive.output_file),
+                duration=f"{duration:.1f}",
+                status_class=status_class))
             
-        tree_content.append('''
+        w('''
                 </div>
             </div>
         ''')
-    
-    return tree_content
 
-def _generate_overview_section(builder: Builder) -> str:
+def _generate_overview_section(builder: Builder, stats: _BuildStats) -> str:
     """Generate HTML for the overview section."""
-    content = []
-    
-    content.append('<h1>Build Overview</h1>')
+    buf = io.StringIO()
+    w = buf.write
+
+    w('<h1>Build Overview</h1>')
 
     # Add toolchain info block
-    content.append(f'''
+    w(f'''
         <div class="code-block">
             <div class="code-caption">
                 <span>Toolchain</span>
@@ -510,36 +735,33 @@ def _generate_overview_section(builder: Builder) -> str:
                 </tr>
                 <tr>
                     <td style="padding: 0.25em 1em;">C Compiler</td>
-                    <td style="padding: 0.25em 1em;">{shlex.join(builder.toolchain.cc + builder.toolchain.cflags)}</td>
+                    <td style="padding: 0.25em 1em;">{_e(shlex.join([*builder.toolchain.cc, *builder.toolchain.cflags]))}</td>
                 </tr>
                 <tr>
                     <td style="padding: 0.25em 1em;">C++ Compiler</td>
-                    <td style="padding: 0.25em 1em;">{shlex.join(builder.toolchain.cxx + builder.toolchain.cxxflags)}</td>
+                    <td style="padding: 0.25em 1em;">{_e(shlex.join([*builder.toolchain.cxx, *builder.toolchain.cxxflags]))}</td>
                 </tr>
                 <tr>
                     <td style="padding: 0.25em 1em;">Archiver</td>
-                    <td style="padding: 0.25em 1em;">{shlex.join(builder.toolchain.ar + builder.toolchain.arflags)}</td>
+                    <td style="padding: 0.25em 1em;">{_e(shlex.join([*builder.toolchain.ar, *builder.toolchain.arflags]))}</td>
                 </tr>
             </table>
         </div>
     ''')
 
-    # Calculate stats for each phase
-    total_features = len(builder.feature_tests)
-    feature_time = sum(test.duration for test in builder.feature_tests if hasattr(test, 'duration'))
-    
-    total_generated = sum(len(task.generated_steps) for task in builder.compile_tasks)
-    generation_time = sum(step.duration for task in builder.compile_tasks for step in task.generated_steps if step.succeeded)
-    
-    total_compiled = sum(len(task.commands) for task in builder.compile_tasks)
-    compilation_time = builder.total_compile_time
-    
-    total_archived = len(builder.archive_tasks)
-    archive_time = sum(archive.result.duration for archive in builder.archive_tasks if archive.result and archive.result.succeeded)
-    
+    # Per-phase stats were gathered in one pass by _collect_build_stats
+    total_features = stats.total_features
+    feature_time = stats.feature_time
+    total_generated = stats.total_generated
+    generation_time = stats.generation_time
+    total_compiled = stats.total_compiled
+    compilation_time = stats.compilation_time
+    total_archived = stats.total_archived
+    archive_time = stats.archive_time
+
     total_time = feature_time + generation_time + compilation_time + archive_time
     
-    content.append('''
+    w('''
         <table class="stats">
             <tr>
                 <th class="stat-label">Phase</th>
@@ -549,7 +771,7 @@ def _generate_overview_section(builder: Builder) -> str:
             </tr>''')
     
     if total_features > 0:
-        content.append(f'''
+        w(f'''
             <tr>
                 <td class="stat-label">Feature Tests</td>
                 <td class="stat-value">{total_features} features</td>
@@ -558,68 +780,67 @@ def _generate_overview_section(builder: Builder) -> str:
             </tr>''')
     
     if total_generated > 0:
-        gen_success = all(step.succeeded for task in builder.compile_tasks for step in task.generated_steps)
-        content.append(f'''
+        gen_success = stats.gen_success
+        w(f'''
             <tr>
                 <td class="stat-label">File Generation</td>
                 <td class="stat-value">{total_generated} files</td>
                 <td class="stat-time">{generation_time:.1f}s</td>
-                <td class="stat-status" style="text-align: center"><span class="status-dot {'success' if gen_success else 'failure'}"></span></td>
+                <td class="stat-status" style="text-align: center"><span class="status-dot {_SUCCESS if gen_success else _FAILURE}"></span></td>
             </tr>''')
     
-    compile_success = all(command.result and command.result.succeeded for task in builder.compile_tasks for command in task.commands)
-    content.append(f'''
+    compile_success = stats.compile_success
+    w(f'''
         <tr>
             <td class="stat-label">Compilation</td>
             <td class="stat-value">{len(builder.compile_tasks)} targets / {total_compiled} files</td>
             <td class="stat-time">{compilation_time:.1f}s</td>
-            <td class="stat-status" style="text-align: center"><span class="status-dot {'success' if compile_success else 'failure'}"></span></td>
+            <td class="stat-status" style="text-align: center"><span class="status-dot {_SUCCESS if compile_success else _FAILURE}"></span></td>
         </tr>''')
     
-    archive_success = all(archive.result and archive.result.succeeded for archive in builder.archive_tasks)
-    content.append(f'''
+    archive_success = stats.archive_success
+    w(f'''
         <tr>
             <td class="stat-label">Archive</td>
             <td class="stat-value">{total_archived} libraries</td>
             <td class="stat-time">{archive_time:.1f}s</td>
-            <td class="stat-status" style="text-align: center"><span class="status-dot {'success' if archive_success else 'failure'}"></span></td>
+            <td class="stat-status" style="text-align: center"><span class="status-dot {_SUCCESS if archive_success else _FAILURE}"></span></td>
         </tr>''')
     
     overall_success = (not total_generated or gen_success) and \
                      compile_success and \
                      archive_success
-    content.append(f'''
+    w(f'''
             <tr class="total">
                 <td>Total</td>
                 <td></td>
                 <td class="stat-time">{total_time:.1f}s</td>
-                <td class="stat-status" style="text-align: center"><span class="status-dot {'success' if overall_success else 'failure'}"></span></td>
+                <td class="stat-status" style="text-align: center"><span class="status-dot {_SUCCESS if overall_success else _FAILURE}"></span></td>
             </tr>
         </table>''')
 
-    return '\n'.join(content)
+    return buf.getvalue()
 
 def _generate_feature_tests_section(builder: Builder) -> str:
     """Generate HTML content for the feature tests section."""
     if not builder.feature_tests:
         return ""
-        
-    content = []
-    content.append('''
+
+    buf = io.StringIO()
+    w = buf.write
+    w('''
         <div id="feature-tests">
             <h1>Feature Tests</h1>
     ''')
     
-    # Group tests by type
-    tests_by_type = {}
-    for test in builder.feature_tests:
-        if test.type not in tests_by_type:
-            tests_by_type[test.type] = []
-        tests_by_type[test.type].append(test)
-    
+    # One (type, variable) sort yields the types in order with each
+    # group already sorted, replacing the dict grouping plus a second
+    # sort inside every group
+    ordered = sorted(builder.feature_tests, key=lambda t: (t.type, t.variable))
+
     # Add each test type section
-    for test_type, tests in sorted(tests_by_type.items()):
-        content.append(f'''
+    for test_type, tests in groupby(ordered, key=lambda t: t.type):
+        w(f'''
             <h2>{test_type.replace('_', ' ').title()} Tests</h2>
             <div class="code-block">
                 <table class="feature-tests" style="width: 100%; border-spacing: 0; padding: 0.25em;">
@@ -631,7 +852,7 @@ def _generate_feature_tests_section(builder: Builder) -> str:
                     </tr>
         ''')
         
-        for test in sorted(tests, key=lambda t: t.variable):
+        for test in tests:
             # Format test details based on type
             if test.type == "compiler_flag":
                 details = test.flag
@@ -649,73 +870,90 @@ def _generate_feature_tests_section(builder: Builder) -> str:
             # Format requesting targets
             targets = ", ".join(sorted(test.requesting_targets))
             
-            content.append(f'''
-                <tr>
-                    <td style="padding: 0.25em 1em;">{test.variable}</td>
-                    <td style="padding: 0.25em 1em;">{details}</td>
-                    <td style="text-align: center; padding: 0.25em 1em;">{str(test.result).lower()}</td>
-                    <td style="padding: 0.25em 1em;">{targets}</td>
-                </tr>
-            ''')
+            w(_FEATURE_ROW_TPL.substitute(
+                variable=_e(test.variable),
+                details=_e(details),
+                result=str(test.result).lower(),
+                targets=_e(targets)))
         
-        content.append('''
+        w('''
                 </table>
             </div>
         ''')
     
-    content.append('</div>')
-    return "\n".join(content)
+    w('</div>')
+    return buf.getvalue()
+
+def _generate_content_sections(builder: Builder, stats: _BuildStats, out,
+                               summaries: Sequence[TaskSummary],
+                               section_cache_dir: Optional[str] = None) -> None:
+    """Write all content sections for the dashboard to `out`."""
+    w = out.write
 
-def _generate_content_sections(builder: Builder) -> List[str]:
-    """Generate all content sections for the dashboard."""
-    content_sections = []
-    
     # Add overview section
-    content_sections.append(_generate_overview_section(builder))
-    
+    w(_generate_overview_section(builder, stats))
+
     # Add feature tests section if there are any
     if builder.feature_tests:
-        content_sections.append(_generate_feature_tests_section(builder))
-    
-    # Add target sections
-    for task in builder.compile_tasks:
-        task_summary = _summarize_task(task)
-        content_sections.append(_generate_task_section(task_summary))
-    
+        w("\n")
+        w(_generate_feature_tests_section(builder))
+
+    # Add target sections. Each section is pure string formatting with no
+    # shared mutable state, so format them concurrently and write in order.
+    if summaries:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            for section in ex.map(
+                    lambda ts: _cached_task_section(ts, section_cache_dir),
+                    summaries):
+                w("\n")
+                w(section)
+
     # Add libraries section if there are any archive tasks
     if builder.archive_tasks:
-        content_sections.append(_generate_libraries_section(builder.archive_tasks))
-    
-    return content_sections
+        w("\n")
+        w(_generate_libraries_section(builder.archive_tasks))
 
 def make_dashboard(builder: Builder, output_path: str) -> None:
     """Generate an HTML dashboard for build results.
-    
+
     Args:
         builder: Builder instance with build results
         output_path: Path to write the HTML file
     """
-    # Generate tree view and content sections
-    tree_content = _generate_tree_view(builder)
-    content_sections = _generate_content_sections(builder)
-    
-    # Combine sections and apply template
-    html = HTML_TEMPLATE.substitute(
-        tree_content="\n".join(tree_content),
-        content="\n".join(content_sections)
-    )
-    
+    # Reset per-build caches; paths from a previous builder are stale noise
+    _basename_cache.clear()
+
+    # One traversal gathers phase status/times for tree view and overview
+    stats = _collect_build_stats(builder)
+
+    # Summarize every task once; both passes iterate the same list
+    summaries = [_summarize_task(task) for task in builder.compile_tasks]
+
     # Ensure output directory exists
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
-    # Write to file
-    with open(output_path, "w", encoding='utf-8') as f:
-        f.write(html)
+
+    # Content-addressed cache of rendered task sections; survives across
+    # runs so incremental rebuilds reuse unchanged sections
+    section_cache_dir = os.path.join(os.path.dirname(output_path), ".dashboard_cache")
+    try:
+        os.makedirs(section_cache_dir, exist_ok=True)
+    except OSError:
+        section_cache_dir = None
+
+    # Stream template chunks and generated sections straight to disk;
+    # peak memory stays at the buffer size instead of the whole page
+    with open(output_path, "w", encoding='utf-8', buffering=1 << 20) as f:
+        f.write(_TPL_HEAD)
+        _generate_tree_view(builder, stats, f, summaries)
+        f.write(_TPL_MID)
+        _generate_content_sections(builder, stats, f, summaries,
+                                   section_cache_dir)
+        f.write(_TPL_TAIL)
 
 def _format_output(stdout: str, stderr: str, success: bool) -> str:
     """Format command output with proper styling"""
     
-    status_class = "success" if success else "failure"
+    status_class = _SUCCESS if success else _FAILURE
     return f'''
         <div class="code-block output-block">
             <div class="code-caption">
@@ -730,16 +968,16 @@ def _format_output(stdout: str, stderr: str, success: bool) -> str:
 
 def _generate_command_output_section(command_result):
     """Generate HTML for command output section."""
-    if command_result['stdout'] or command_result['stderr']:
+    if command_result.stdout or command_result.stderr:
         output = []
-        if command_result['stdout']:
-            output.append(command_result['stdout'])
-        if command_result['stderr']:
+        if command_result.stdout:
+            output.append(command_result.stdout)
+        if command_result.stderr:
             if output:  # If we already have stdout
                 output.append("\n--- stderr ---\n")
-            output.append(command_result['stderr'])
+            output.append(command_result.stderr)
             
-        return rf'''
+        return f'''
             <div class="code-block output-block">
                 <div class="code-caption">
                     <span>Command Output</span>
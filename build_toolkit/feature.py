@@ -5,8 +5,10 @@ compiler features, headers, functions, and symbols at build time.
 """
 
 import os
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any, Set
+from functools import lru_cache
+from typing import List, Optional, Dict, Any, Set, Tuple
 
 @dataclass
 class CompilerFlagCheck:
@@ -33,6 +35,16 @@ class TypeCheck:
     language: str = "c"  # Language to test with ("c" or "c++")
     result: bool = False # Test result
 
+# Required fields per test type; one dict lookup replaces the
+# if/elif chain in __post_init__ and adding a test type is a table entry
+_TEST_REQUIREMENTS = {
+    'compiler_flag': ("Compiler flag", ('flag',)),
+    'header': ("Header", ('headers',)),
+    'type': ("Type", ('type_name', 'headers')),
+    'function': ("Function", ('function', 'headers')),
+    'struct_member': ("Struct member", ('struct_name', 'member', 'headers')),
+}
+
 @dataclass
 class FeatureTestTask:
     """Represents a feature test to be executed.
@@ -66,66 +78,72 @@ class FeatureTestTask:
     
     def __post_init__(self):
         """Validate required fields based on test type."""
-        if self.type == 'compiler_flag':
-            if not self.flag:
-                raise ValueError(f"Compiler flag test {self.variable} missing required 'flag' field")
-        elif self.type == 'type':
-            if not self.type_name:
-                raise ValueError(f"Type test {self.variable} missing required 'type_name' field")
-            if not self.headers:
-                raise ValueError(f"Type test {self.variable} missing required 'headers' field")
-        elif self.type == 'function':
-            if not self.function:
-                raise ValueError(f"Function test {self.variable} missing required 'function' field")
-            if not self.headers:
-                raise ValueError(f"Function test {self.variable} missing required 'headers' field")
-        elif self.type == 'header':
-            if not self.headers:
-                raise ValueError(f"Header test {self.variable} missing required 'headers' field")
-        elif self.type == 'struct_member':
-            if not self.struct_name:
-                raise ValueError(f"Struct member test {self.variable} missing required 'struct_name' field")
-            if not self.member:
-                raise ValueError(f"Struct member test {self.variable} missing required 'member' field")
-            if not self.headers:
-                raise ValueError(f"Struct member test {self.variable} missing required 'headers' field")
-        else:
-            raise ValueError(f"Unknown test type: {self.type}")
+        try:
+            label, required = _TEST_REQUIREMENTS[self.type]
+        except KeyError:
+            raise ValueError(f"Unknown test type: {self.type}") from None
+        for field_name in required:
+            if not getattr(self, field_name):
+                raise ValueError(
+                    f"{label} test {self.variable} missing required '{field_name}' field")
+
+        # Flags and headers recur across many tasks (-Wall, stdio.h, ...);
+        # interning collapses the duplicates and speeds set hashing
+        self.variable = sys.intern(self.variable)
+        self.language = sys.intern(self.language)
+        self.headers = [sys.intern(header) for header in self.headers]
+        if self.flag:
+            self.flag = sys.intern(self.flag)
+        if self.type_name:
+            self.type_name = sys.intern(self.type_name)
+        if self.function:
+            self.function = sys.intern(self.function)
+        if self.struct_name:
+            self.struct_name = sys.intern(self.struct_name)
+        if self.member:
+            self.member = sys.intern(self.member)
+
+        # Identity tuple used by __hash__/__eq__; computed once so set
+        # deduplication across targets doesn't re-sort headers per
+        # comparison
+        self._key = (self.type, self.variable, self.language, self.flag,
+                     tuple(sorted(self.headers)), self.type_name,
+                     self.function, self.struct_name, self.member)
 
     def __hash__(self) -> int:
         """Hash based on test attributes that determine uniqueness."""
-        return hash((self.type, self.variable, self.language, self.flag, 
-                    tuple(sorted(self.headers)), self.type_name, self.function,
-                    self.struct_name, self.member))
+        return hash(self._key)
 
     def __eq__(self, other) -> bool:
         """Equality based on test attributes that determine uniqueness."""
-        if not isinstance(other, FeatureTestTask):
-            return False
-        return (self.type == other.type and
-                self.variable == other.variable and
-                self.language == other.language and
-                self.flag == other.flag and
-                sorted(self.headers) == sorted(other.headers) and
-                self.type_name == other.type_name and
-                self.function == other.function and
-                self.struct_name == other.struct_name and
-                self.member == other.member)
+        return isinstance(other, FeatureTestTask) and self._key == other._key
+
+@lru_cache(maxsize=None)
+def includes_block(headers: Tuple[str, ...]) -> str:
+    """Render the #include block for a probe source.
+
+    Many tests share the same header tuple, so the joined block is
+    memoized per tuple.
+    """
+    return "\n".join(f"#include <{header}>" for header in headers)
+
+# Probe source templates, rendered in one pass via str.format_map;
+# literal C braces are escaped as {{ }}
 
 # Template for testing compiler flags
 COMPILER_FLAG_TEST_TEMPLATE = """
-int main(void) {
+int main(void) {{
     return 0;
-}
+}}
 """
 
 # Template for testing headers
 HEADER_TEST_TEMPLATE = """
 {includes}
 
-int main(void) {
+int main(void) {{
     return 0;
-}
+}}
 """
 
 # Template for testing types
@@ -133,27 +151,27 @@ TYPE_TEST_TEMPLATE = """
 {includes}
 
 char (*p(void))[sizeof({type_name})];
-int main(void) {
+int main(void) {{
     return 0;
-}
+}}
 """
 
 # Template for testing functions
 FUNCTION_TEST_TEMPLATE = """
 {includes}
 
-int main(void) {
+int main(void) {{
     return (unsigned long long){function};
-}
+}}
 """
 
 # Template for testing struct members
 STRUCT_MEMBER_TEST_TEMPLATE = """
 {includes}
 
-int main(void) {
+int main(void) {{
     /* The array size will be negative if member doesn't exist */
     char (*p)[sizeof(((struct {struct_name}*)0)->{member})];
     return 0;
-}
-""" 
\ No newline at end of file
+}}
+"""
\ No newline at end of file
@@ -1,6 +1,7 @@
 """Build target configuration module."""
 
 import os
+import sys
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 
@@ -49,6 +50,16 @@ class GeneratedFile:
             definitions=data['definitions']
         )
 
+# from_dict validation tables, built once instead of per call
+_TARGET_LIST_FIELDS = (
+    'sources', 'include_dirs', 'private_include_dirs',
+    'definitions', 'private_definitions',
+    'dependencies', 'system_dependencies', 'feature_tests')
+_TARGET_STRING_FIELDS = ('root', 'output')
+_TARGET_VALID_FIELDS = frozenset(
+    (*_TARGET_LIST_FIELDS, *_TARGET_STRING_FIELDS,
+     'name', 'generated_files', 'options'))
+
 @dataclass
 class Target:
     """Build target configuration.
@@ -81,6 +92,54 @@ class Target:
     generated_files: List[GeneratedFile] = field(default_factory=list)
     options: Dict[str, Any] = field(default_factory=dict)
     feature_tests: List[Any] = field(default_factory=list)
+    # Memoized ${gen} expansions keyed by raw path; _expand_cache_gen
+    # records the gen path the entries were computed against
+    _expand_cache: Dict[str, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _expand_cache_gen: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Intern the name and the path strings that circulate through
+        # dependency sets and include-dir dedup; interned strings hash
+        # once and compare by pointer identity in dict/set lookups
+        self.name = sys.intern(self.name)
+        self.root = sys.intern(self.root)
+        self.include_dirs = [sys.intern(d) for d in self.include_dirs]
+        self.private_include_dirs = [sys.intern(d) for d in self.private_include_dirs]
+
+    def _expand_path_vars(self, path: str, builder: Any) -> str:
+        """Expand variables in a path string for this target.
+
+        Replaces every ${gen} occurrence with the target's generated files
+        directory under the builder's gen_dir. Expansions are memoized per
+        raw path; the cache is dropped whenever the builder's gen_dir (and
+        so the expansion) changes.
+
+        Args:
+            path: Path string that may contain variables
+            builder: Builder providing the gen_dir
+
+        Returns:
+            Path with all variables expanded
+        """
+        # Most paths carry no variables at all; a C-level substring scan
+        # is cheaper than the cache bookkeeping below
+        if "${" not in path:
+            return path
+        # Direct concatenation: the name is never absolute, so join's
+        # absolute-reset handling would be dead weight here; consumers
+        # normalize at the boundary either way
+        gen_path = f"{builder.gen_dir}{os.sep}{self.name}"
+        cache = self._expand_cache
+        if self._expand_cache_gen != gen_path:
+            cache.clear()
+            self._expand_cache_gen = gen_path
+        expanded = cache.get(path)
+        if expanded is None:
+            expanded = sys.intern(path.replace("${gen}", gen_path))
+            cache[path] = expanded
+        return expanded
 
     @classmethod
     def from_dict(cls, *, data: Dict[str, Any]) -> 'Target':
@@ -111,13 +170,8 @@ class Target:
             ValueError: If name is missing, if any fields have invalid types,
                        or if unknown fields are present
         """
-        # Check for unknown fields
-        valid_fields = {'name', 'root', 'sources', 
-                       'include_dirs', 'private_include_dirs',
-                       'definitions', 'private_definitions',
-                       'dependencies', 'system_dependencies',
-                       'output', 'generated_files', 'options', 'feature_tests'}
-        unknown_fields = set(data.keys()) - valid_fields
+        # Check for unknown fields against the module-level table
+        unknown_fields = data.keys() - _TARGET_VALID_FIELDS
         if unknown_fields:
             raise ValueError(f"Unknown fields in configuration: {', '.join(unknown_fields)}")
 
@@ -126,38 +180,28 @@ class Target:
             raise ValueError("Missing required field 'name'")
         if not isinstance(data['name'], str):
             raise ValueError("Field 'name' must be of type str")
-        
-        # Set defaults for optional list fields
-        list_fields = {
-            'sources': [],
-            'include_dirs': [],
-            'private_include_dirs': [],
-            'definitions': [],
-            'private_definitions': [],
-            'dependencies': [],
-            'system_dependencies': [],
-            'feature_tests': []
-        }
-        
-        # Validate and set defaults for list fields
-        for field, default in list_fields.items():
-            if field in data:
-                if data[field] is None:
-                    data[field] = default
-                elif not isinstance(data[field], list):
-                    raise ValueError(f"Field '{field}' must be of type list")
-                elif not all(isinstance(item, str) for item in data[field]):
-                    raise ValueError(f"All elements in '{field}' must be of type str")
-            else:
-                data[field] = default
-        
+
+        # Validate and set defaults for list fields in one pass
+        for field in _TARGET_LIST_FIELDS:
+            value = data.get(field)
+            if value is None:
+                data[field] = []
+            elif not isinstance(value, list):
+                raise ValueError(f"Field '{field}' must be of type list")
+            elif value and set(map(type, value)) != {str}:
+                # One C-level pass accepts the common all-str case; the
+                # per-item isinstance walk only runs for mixed lists so
+                # str subclasses are still accepted
+                for item in value:
+                    if not isinstance(item, str):
+                        raise ValueError(f"All elements in '{field}' must be of type str")
+
         # Validate optional string fields
-        string_fields = ['root', 'output']
-        for field in string_fields:
-            if field in data and data[field] is not None:
-                if not isinstance(data[field], str):
-                    raise ValueError(f"Field '{field}' must be of type str")
-        
+        for field in _TARGET_STRING_FIELDS:
+            value = data.get(field)
+            if value is not None and not isinstance(value, str):
+                raise ValueError(f"Field '{field}' must be of type str")
+
         # Handle generated_files
         if 'generated_files' in data:
             if data['generated_files'] is not None:
@@ -1,5 +1,6 @@
 """Compiler toolchain configuration module."""
 
+from functools import cached_property
 from typing import List, Optional
 from .compiler import determine_compiler_id
 
@@ -13,8 +14,8 @@ class Toolchain:
                  cxx: str | List[str],
                  cxxflags: List[str],
                  # C compiler settings
-                 cc: str | List[str],
-                 cflags: List[str],
+                 cc: Optional[str | List[str]] = None,
+                 cflags: Optional[List[str]] = None,
                  # Library archiver
                  ar: str | List[str],
                  arflags: List[str],
@@ -42,13 +43,15 @@ class Toolchain:
         self.arch = arch
                 
         self.cxx = cxx if isinstance(cxx, list) else [cxx]
-        self.cxxflags = cxxflags
-        self.cc = cc if isinstance(cc, list) else [cc]
-        self.cflags = cflags
-        
+        # Flags are stored as tuples: immutable, so every compile task
+        # can share them without defensive copies
+        self.cxxflags = tuple(cxxflags)
+        self.cc = self.cxx if cc is None else (cc if isinstance(cc, list) else [cc])
+        self.cflags = self.cxxflags if cflags is None else tuple(cflags)
+
         # Library archiver
-        self.ar = ar if isinstance(ar, list) else [ar]   
-        self.arflags = arflags
+        self.ar = ar if isinstance(ar, list) else [ar]
+        self.arflags = tuple(arflags)
         
         # Library naming
         self.lib_prefix = lib_prefix
@@ -62,5 +65,13 @@ class Toolchain:
         if len(self.ar) == 0:
             raise ValueError("Missing AR archiver")
 
-        # Compiler identification
-        self.compiler_id = compiler_id if compiler_id is not None else determine_compiler_id(self.cc[0], self.cxx[0])
+        # Compiler identification; auto-detection is deferred until
+        # compiler_id is first read
+        self._compiler_id = compiler_id
+
+    @cached_property
+    def compiler_id(self) -> str:
+        """Compiler identifier (gcc, clang, msvc), detected on first use."""
+        if self._compiler_id is not None:
+            return self._compiler_id
+        return determine_compiler_id(self.cc[0], self.cxx[0])
@@ -1,16 +1,29 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 
+@lru_cache(maxsize=4096)
 def normalize_path(path: str) -> str:
-    """Convert path to use forward slashes and remove trailing /, handle ../ with abspath"""
-    path = os.path.abspath(path)  # Handle ../ and ./ in paths
-    path = path.replace('\\', '/')
+    """Convert path to use forward slashes and remove trailing /, handle ../ with abspath
+
+    The same roots and include dirs are normalized over and over during
+    target resolution, so results are memoized per input path.
+    """
+    path = os.path.abspath(path).replace('\\', '/')  # Handle ../ and ./ in paths
     if path.endswith('/.'):
-        path = path[:-2]
-    elif path.endswith('/'):
-        path = path[:-1]
+        return path[:-2]
+    if path.endswith('/'):
+        return path[:-1]
     return path
 
+# Directories already created in this process; repeat calls for the few
+# shared output dirs skip the mkdir/stat syscalls entirely
+_ensured_dirs = set()
+
 def ensure_dir(directory: str):
     """Create directory if it doesn't exist"""
-    Path(directory).mkdir(parents=True, exist_ok=True) 
\ No newline at end of file
+    directory = os.path.normpath(directory)
+    if directory in _ensured_dirs:
+        return
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(directory)
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""Shared pytest fixtures for the test suite."""
+
+import pytest
+
+from build_toolkit import Builder, Toolchain
+
+
+@pytest.fixture(scope="session")
+def gcc_toolchain():
+    """One read-only gcc toolchain shared by the whole test session.
+
+    Toolchain is immutable configuration, so tests that only need a
+    plausible compiler setup can share a single instance instead of
+    rebuilding it per test.
+    """
+    return Toolchain(
+        os="linux",
+        arch="x86_64",
+        cxx="g++",
+        cxxflags=["-c", "-Wall"],
+        ar="ar",
+        arflags=["rcs"],
+        compiler_id="gcc"
+    )
+
+
+@pytest.fixture
+def builder_factory(gcc_toolchain):
+    """Create per-test Builders that share the session toolchain.
+
+    Builders accumulate targets and task state, so each test gets a
+    fresh instance; only the toolchain is reused.
+    """
+    def make(*, gen_dir="/build/gen", obj_dir="/build/obj",
+             lib_dir="/build/lib", **kwargs):
+        return Builder(
+            toolchain=gcc_toolchain,
+            gen_dir=gen_dir,
+            obj_dir=obj_dir,
+            lib_dir=lib_dir,
+            **kwargs
+        )
+    return make
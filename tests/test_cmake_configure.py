@@ -230,4 +230,24 @@ def test_newline_handling():
     finally:
         os.unlink(in_path)
         if os.path.exists(out_path):
-            os.unlink(out_path) 
\ No newline at end of file
+            os.unlink(out_path) 
+def test_stream_api():
+    """Test the in-memory stream form of the configure API"""
+    import io
+    from build_toolkit.cmake_configure import cmake_configure_stream
+
+    template = dedent("""\
+        #cmakedefine HAVE_FEATURE
+        #define VERSION @VERSION@
+        const char* name = "${NAME}";""")
+    output = io.StringIO()
+    cmake_configure_stream(io.StringIO(template), output, {
+        "HAVE_FEATURE": True,
+        "VERSION": "1.2.3",
+        "NAME": "test",
+    })
+    expected = dedent("""\
+        #define HAVE_FEATURE 1
+        #define VERSION "1.2.3"
+        const char* name = "test";""") + "\n"
+    assert output.getvalue() == expected
@@ -1,32 +1,19 @@
 """Tests for include directory handling in build system."""
 
 import os
-from typing import List
 
-from build_toolkit import Target, Builder, Toolchain
-from build_toolkit.utils import normalize_path
+from build_toolkit import Target
 
+# Already-canonical POSIX literal: these tests never touch the
+# filesystem, so there is no need for os.path.abspath and the
+# getcwd/stat syscalls it can trigger
+ROOT_DIR = "/test_root"
 
-def normalize_paths(paths: List[str]) -> List[str]:
-    """Normalize paths for comparison."""
-    return [os.path.normpath(p) for p in paths]
 
-
-def create_test_builder(root_dir: str) -> Builder:
+def create_test_builder(builder_factory, root_dir: str):
     """Create a builder instance for testing with absolute paths."""
     build_dir = os.path.join(root_dir, "build")
-    return Builder(
-        toolchain=Toolchain(
-            os="linux",
-            arch="x86_64",
-            cc=["gcc"], 
-            cxx=["g++"],
-            cflags=[],
-            cxxflags=[],
-            ar="ar",
-            arflags=["-rcs"],
-            compiler_id="gcc"
-        ),
+    return builder_factory(
         gen_dir=os.path.join(build_dir, "gen"),
         obj_dir=os.path.join(build_dir, "obj"),
         lib_dir=os.path.join(build_dir, "lib"),
@@ -34,10 +21,9 @@ def create_test_builder(root_dir: str) -> Builder:
     )
 
 
-def test_basic_includes():
+def test_basic_includes(builder_factory):
     """Test basic include directory handling."""
-    # Use absolute paths for all directories
-    root_dir = os.path.abspath("test_root")
+    root_dir = ROOT_DIR
     
     target = Target(
         name="test",
@@ -47,27 +33,27 @@ def test_basic_includes():
     )
     
     # Create builder and add target
-    builder = create_test_builder(root_dir)
+    builder = create_test_builder(builder_factory, root_dir)
     builder.add_target(target)
     builder._setup_all_tasks()  # Set up includes and definitions
     
     # Get the compile task for our target
-    task = next(t for t in builder.compile_tasks if t.target.name == "test")
+    task = builder.compile_tasks_by_name["test"]
     
     # Verify includes
-    expected_public = normalize_paths([os.path.join(root_dir, "include")])
-    expected_private = normalize_paths([os.path.join(root_dir, "src/internal")])
+    expected_public = sorted([os.path.join(root_dir, "include")])
+    expected_private = sorted([os.path.join(root_dir, "src/internal")])
     
-    actual_public = normalize_paths(task.public_include_dirs)
-    actual_private = normalize_paths(task.private_include_dirs)
+    actual_public = sorted(task.public_include_dirs)
+    actual_private = sorted(task.private_include_dirs)
     
     assert expected_public == actual_public, "Public include dirs should match"
     assert expected_private == actual_private, "Private include dirs should match"
 
 
-def test_dependency_includes():
+def test_dependency_includes(builder_factory):
     """Test include directory handling with dependencies."""
-    root_dir = os.path.abspath("test_root")
+    root_dir = ROOT_DIR
     
     # Create dependency target
     dep = Target(
@@ -87,33 +73,33 @@ def test_dependency_includes():
     )
     
     # Create builder and add targets
-    builder = create_test_builder(root_dir)
+    builder = create_test_builder(builder_factory, root_dir)
     builder.add_target(dep)
     builder.add_target(main)
     builder._setup_all_tasks()  # Set up includes and definitions
     
     # Get the compile task for main target
-    task = next(t for t in builder.compile_tasks if t.target.name == "main")
+    task = builder.compile_tasks_by_name["main"]
     
     # Verify includes
-    expected_public = normalize_paths([
+    expected_public = sorted([
         os.path.join(root_dir, "main/include"),
         os.path.join(root_dir, "dep/include")
     ])
-    expected_private = normalize_paths([
+    expected_private = sorted([
         os.path.join(root_dir, "main/src")
     ])
     
-    actual_public = normalize_paths(task.public_include_dirs)
-    actual_private = normalize_paths(task.private_include_dirs)
+    actual_public = sorted(task.public_include_dirs)
+    actual_private = sorted(task.private_include_dirs)
     
     assert set(expected_public) == set(actual_public), "Public include dirs should include dependency's public includes"
     assert expected_private == actual_private, "Private include dirs should only contain own private includes"
 
 
-def test_diamond_dependency():
+def test_diamond_dependency(builder_factory):
     """Test include directory handling with diamond dependency pattern."""
-    root_dir = os.path.abspath("test_root")
+    root_dir = ROOT_DIR
     
     # Create base target
     base = Target(
@@ -146,7 +132,7 @@ def test_diamond_dependency():
     )
     
     # Create builder and add all targets
-    builder = create_test_builder(root_dir)
+    builder = create_test_builder(builder_factory, root_dir)
     builder.add_target(base)
     builder.add_target(left)
     builder.add_target(right)
@@ -154,17 +140,17 @@ def test_diamond_dependency():
     builder._setup_all_tasks()  # Set up includes and definitions
     
     # Get the compile task for main target
-    task = next(t for t in builder.compile_tasks if t.target.name == "main")
+    task = builder.compile_tasks_by_name["main"]
     
     # Verify includes
-    expected = normalize_paths([
+    expected = sorted([
         os.path.join(root_dir, "main/include"),
         os.path.join(root_dir, "left/include"),
         os.path.join(root_dir, "right/include"),
         os.path.join(root_dir, "base/include")
     ])
     
-    actual = normalize_paths(task.public_include_dirs)
+    actual = sorted(task.public_include_dirs)
     
     assert set(expected) == set(actual), "Include dirs should handle diamond dependency correctly"
   
\ No newline at end of file
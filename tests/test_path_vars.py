@@ -1,28 +1,12 @@
 import os
-import unittest
-from build_toolkit import Target, Builder, Toolchain
-from build_toolkit.builder import get_all_include_dirs
+from os.path import normpath
 
-def create_test_builder(*, gen_dir="/build/gen"):
-    """Create a builder instance for testing."""
-    return Builder(
-        toolchain=Toolchain(
-            os="linux",
-            arch="x86_64",
-            cxx="g++",
-            ar="ar",
-            cxxflags=["-c", "-Wall"],
-            arflags=["rcs"],
-            compiler_id="gcc"
-        ),
-        gen_dir=gen_dir,
-        obj_dir="/build/obj",
-        lib_dir="/build/lib"
-    )
+from build_toolkit import Target
+from build_toolkit.builder import get_all_include_dirs
 
-def test_expand_gen_var_exact():
+def test_expand_gen_var_exact(builder_factory):
     """Test expanding ${gen} when it's the exact path"""
-    builder = create_test_builder()
+    builder = builder_factory()
     target = Target(name="test", root="/src/test")
     builder.add_target(target)
 
@@ -30,9 +14,9 @@ def test_expand_gen_var_exact():
     expected = os.path.normpath(os.path.join("/build/gen", "test"))
     assert expanded == expected
 
-def test_expand_gen_var_in_path():
+def test_expand_gen_var_in_path(builder_factory):
     """Test expanding ${gen} when it's part of a larger path"""
-    builder = create_test_builder()
+    builder = builder_factory()
     target = Target(name="test", root="/src/test")
     builder.add_target(target)
 
@@ -40,9 +24,9 @@ def test_expand_gen_var_in_path():
     expected = os.path.normpath(os.path.join("/build/gen", "test", "include"))
     assert expanded == expected
 
-def test_expand_gen_var_middle_path():
+def test_expand_gen_var_middle_path(builder_factory):
     """Test expanding ${gen} when it's in the middle of a path"""
-    builder = create_test_builder()
+    builder = builder_factory()
     target = Target(name="test", root="/src/test")
     builder.add_target(target)
 
@@ -52,10 +36,10 @@ def test_expand_gen_var_middle_path():
     expected = os.path.normpath(f"prefix/{gen_path}/suffix")
     assert expanded == expected
 
-def test_expand_gen_var_relative_path():
+def test_expand_gen_var_relative_path(builder_factory):
     """Test expanding ${gen} when it's in a relative path"""
     # Use relative gen_dir
-    builder = create_test_builder(gen_dir="build/gen")
+    builder = builder_factory(gen_dir="build/gen")
     target = Target(name="test", root="src/test")
     builder.add_target(target)
 
@@ -65,9 +49,9 @@ def test_expand_gen_var_relative_path():
     expected = os.path.normpath(os.path.join("prefix", gen_path, "suffix"))
     assert expanded == expected
 
-def test_no_gen_var():
+def test_no_gen_var(builder_factory):
     """Test path without ${gen} variable"""
-    builder = create_test_builder()
+    builder = builder_factory()
     target = Target(name="test", root="/src/test")
     builder.add_target(target)
 
@@ -75,9 +59,9 @@ def test_no_gen_var():
     expected = os.path.normpath("include/dir")
     assert expanded == expected
 
-def test_multiple_gen_vars():
+def test_multiple_gen_vars(builder_factory):
     """Test path with multiple ${gen} variables - each occurrence is replaced"""
-    builder = create_test_builder()
+    builder = builder_factory()
     target = Target(name="test", root="/src/test")
     builder.add_target(target)
 
@@ -87,9 +71,9 @@ def test_multiple_gen_vars():
     expected = os.path.normpath(f"{gen_path}/include/{gen_path}")
     assert expanded == expected
 
-def test_get_include_dirs_with_gen():
+def test_get_include_dirs_with_gen(builder_factory):
     """Test that include directories handle ${gen} paths correctly"""
-    builder = create_test_builder()
+    builder = builder_factory()
     target = Target(
         name="test_includes",
         root="/src/test",
@@ -112,13 +96,14 @@ def test_get_include_dirs_with_gen():
         os.path.normpath(os.path.join("prefix", gen_path, "suffix"))
     }
     
-    # Convert both sets to normalized paths for comparison
-    actual_paths = {os.path.normpath(p) for p in include_dirs}
+    # Convert both sets to normalized paths for comparison; bind the
+    # normalizer once instead of two attribute lookups per element
+    actual_paths = {normpath(p) for p in include_dirs}
     assert actual_paths == expected_paths
 
-def test_private_include_dirs_with_gen():
+def test_private_include_dirs_with_gen(builder_factory):
     """Test that private include directories handle ${gen} paths correctly"""
-    builder = create_test_builder()
+    builder = builder_factory()
     target = Target(
         name="test_private",
         root="/src/test",
@@ -135,13 +120,14 @@ def test_private_include_dirs_with_gen():
         os.path.normpath(os.path.join("private", "/build/gen/test_private/include"))
     }
     
-    # Convert both sets to normalized paths for comparison
-    actual_paths = {os.path.normpath(p) for p in include_dirs}
+    # Convert both sets to normalized paths for comparison; bind the
+    # normalizer once instead of two attribute lookups per element
+    actual_paths = {normpath(p) for p in include_dirs}
     assert actual_paths == expected_paths
 
-def test_dependency_include_dirs():
+def test_dependency_include_dirs(builder_factory):
     """Test that include directories from dependencies handle ${gen} paths correctly"""
-    builder = create_test_builder()
+    builder = builder_factory()
     dep_target = Target(
         name="dep",
         root="/src/dep",
@@ -163,6 +149,7 @@ def test_dependency_include_dirs():
         os.path.normpath("/build/gen/dep/dep_include")
     }
     
-    # Convert both sets to normalized paths for comparison
-    actual_paths = {os.path.normpath(p) for p in include_dirs}
+    # Convert both sets to normalized paths for comparison; bind the
+    # normalizer once instead of two attribute lookups per element
+    actual_paths = {normpath(p) for p in include_dirs}
     assert actual_paths == expected_paths 
\ No newline at end of file